@@ -15,8 +15,8 @@ import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from types import ModuleType
-from typing import Dict, Generator
+from types import MappingProxyType, ModuleType
+from typing import Dict, Generator, Mapping
 import uuid
 
 import pytest
@@ -461,6 +461,7 @@ def lc_http_proxy(env: Env) -> Generator[Dict[str, object], None, None]:
     启动本地 HTTP proxy（Basic auth + CONNECT），供 P1 proxy 一致性用例使用。
     - 每个测试函数单独启动，避免跨 case 的日志混淆
     - 输出 JSONL 日志用于“请求语义摘要”对齐
+    - yield 的字段已是最终类型（port:int、log_file:Path、url:str），用例直接取用
     """
     run_dir = Path(env.gen_dir) / f"lc_http_proxy_{uuid.uuid4().hex[:8]}"
     cmd = _REPO_ROOT / "tests" / "libcurl_consistency" / "http_proxy_server.py"
@@ -509,7 +510,8 @@ def lc_http_proxy(env: Env) -> Generator[Dict[str, object], None, None]:
         try:
             yield {
                 "port": proxy_port,
-                "log_file": str(log_file),
+                "url": f"http://localhost:{proxy_port}",
+                "log_file": log_file,
                 "username": username,
                 "password": password,
             }
@@ -667,6 +669,7 @@ def lc_observe_http(env: Env) -> Generator[Dict[str, object], None, None]:
     """
     启动最小 HTTP/1.1 观测服务端（/cookie、/status/<code>）。
     - 每个测试函数单独启动，避免跨 case 的日志混淆
+    - 返回 {"port": int, "log_file": Path}
     """
     run_dir = Path(env.gen_dir) / f"lc_observe_http_{uuid.uuid4().hex[:8]}"
     cmd = _REPO_ROOT / "tests" / "libcurl_consistency" / "http_observe_server.py"
@@ -708,7 +711,7 @@ def lc_observe_http(env: Env) -> Generator[Dict[str, object], None, None]:
         try:
             yield {
                 "port": http_port,
-                "log_file": str(log_file),
+                "log_file": log_file,
             }
         finally:
             if proc:
@@ -871,6 +874,27 @@ def lc_observe_https(env: Env) -> Generator[Dict[str, object], None, None]:
             if proc:
                 proc.terminate()
 
+@pytest.fixture(scope="session")
+def lc_qt_path() -> Path:
+    """
+    会话级解析 QCURL_QTTEST（缺失即报错，不降级为 skip）。
+    - session 级 fixture 先于 function 级服务端 fixture 实例化：二进制缺失时不会先拉起 observe/proxy 服务端
+    - 失败结果由 pytest 缓存，后续用例直接复用同一错误
+    """
+    from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest
+
+    return require_qcurl_qttest()
+
+
+@pytest.fixture(scope="session")
+def lc_ports_ctx(env) -> Mapping[str, int]:
+    """
+    会话级端口上下文，供 case_defs 中 `{http_port}`/`{https_port}` 模板直接 format_map。
+    - 不含 ws_port：ws 端口由 lc_ws_echo 按需分配并回写 env，需在用例内读取
+    """
+    return MappingProxyType({"http_port": int(env.http_port), "https_port": int(env.https_port)})
+
+
 @pytest.fixture(scope="session")
 def lc_logs(httpd, nghttpx):
     """
@@ -892,6 +916,22 @@ def lc_logs(httpd, nghttpx):
     return logs
 
 
+@pytest.fixture(scope="session")
+def lc_access_log_index(lc_logs):
+    """
+    会话级 access_log 增量索引（按 id 查询，避免每次观测都全量重扫 access_log）。
+    - 键：httpd / nghttpx；对应服务未启用时不提供该键
+    """
+    from tests.libcurl_consistency.pytest_support.observed import httpd_access_log_index, nghttpx_access_log_index
+
+    indexes = {}
+    if "httpd_access_log" in lc_logs:
+        indexes["httpd"] = httpd_access_log_index(Path(lc_logs["httpd_access_log"]))
+    if "nghttpx_access_log" in lc_logs:
+        indexes["nghttpx"] = nghttpx_access_log_index(Path(lc_logs["nghttpx_access_log"]))
+    return indexes
+
+
 @pytest.fixture(scope="session")
 def lc_ws_logs(lc_ws_echo):
     """
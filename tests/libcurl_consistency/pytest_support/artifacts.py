@@ -4,11 +4,18 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
 
 
 ARTIFACTS_SCHEMA = "qcurl-lc/artifacts@v1"
+# 响应侧空 body（如 HEAD/204）的摘要固定值，避免逐次初始化哈希对象
+_EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+# baseline 客户端在 stderr 末尾输出的 `curlcode=<n> http_code=<n>` 行
+_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
 
 def apply_error_namespaces(payload: Dict[str, Any],
                            *,
@@ -47,13 +54,30 @@ def apply_error_namespaces(payload: Dict[str, Any],
     payload["derived"] = derived
 
 
+def parse_curlcode_http_code(stderr_lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    从 baseline stderr 提取 (curlcode, http_code)；未找到时返回 (-1, -1)。
+    该行由客户端在结束前输出，故从尾部向前扫描。
+    """
+    lines = stderr_lines if isinstance(stderr_lines, Sequence) else list(stderr_lines)
+    for line in reversed(lines):
+        m = _CURLINFO_RE.search(str(line))
+        if m:
+            return int(m.group(1)), int(m.group(2))
+    return -1, -1
+
+
 def artifacts_root(env) -> Path:
     """默认将 artifacts 放在 testenv 的 gen_dir 下，避免污染源码树。"""
     return Path(env.gen_dir) / "artifacts"
 
 
+@lru_cache(maxsize=None)
 def ensure_case_dir(root: Path, suite: str, case: str) -> Path:
-    """创建套件/用例目录，返回最终目录。"""
+    """
+    创建套件/用例目录，返回最终目录。
+    - 结果按 (root, suite, case) 缓存：会话内不会删除用例目录，首次创建后无需重复 mkdir/stat
+    """
     case_dir = root / suite / case
     case_dir.mkdir(parents=True, exist_ok=True)
     return case_dir
@@ -68,9 +92,35 @@ def artifact_path(root: Path, suite: str, case: str, flavor: str, ext: str = "js
 
 
 def write_json(path: Path, payload: Dict[str, Any]) -> None:
-    """以 utf-8 写出 JSON。"""
+    """
+    以 utf-8 写出 JSON。
+    - 先写同目录临时文件再 os.replace，读者（compare/gate postflight）不会看到半写入的文件
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    data = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_results(*results: Optional[Dict[str, Any]]) -> None:
+    """
+    写出 run_libtest_case/run_qt_test（persist=False）返回的 {"path", "payload"}。
+    - 供用例失败路径留存证据：尚未运行的一侧为 None，跳过
+    """
+    for result in results:
+        if result is not None:
+            write_json(result["path"], result["payload"])
+
+
+def read_json(path: Path) -> Any:
+    """读取 JSON 文件：按 bytes 交给 json 解析（自动识别 UTF-8），省去中间 str 解码拷贝。"""
+    with path.open("rb") as f:
+        return json.load(f)
 
 
 def sha256_bytes(data: bytes) -> str:
@@ -93,10 +143,22 @@ def build_request_semantic(method: str,
                            url: str,
                            headers: Optional[Dict[str, str]] = None,
                            body: Optional[bytes] = None,
-                           raw_lines: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+                           raw_lines: Optional[Iterable[str]] = None,
+                           body_sha256: Optional[str] = None) -> Dict[str, Any]:
+    """
+    请求侧语义摘要。
+    - body_sha256：调用方已算好的 body 摘要（同一 body 在 baseline/qcurl 与观测回填中复用，避免重复哈希）
+    """
     headers_norm = normalize_headers(headers or {})
     body_len = len(body) if body else 0
-    body_hash = sha256_bytes(body) if body else ""
+    if not body:
+        # 请求侧口径：无 body（HEAD/GET/DELETE 等）记为空摘要，而非 sha256(b"")
+        body_hash = ""
+    elif body_sha256:
+        assert len(body_sha256) == 64, f"body_sha256 应为 64 位 hex 摘要: {body_sha256!r}"
+        body_hash = body_sha256
+    else:
+        body_hash = sha256_bytes(body)
     out: Dict[str, Any] = {
         "method": method.upper(),
         "url": url,
@@ -125,7 +187,7 @@ def build_response_summary(status: int,
     headers_norm = normalize_headers(headers or {})
     if body is not None:
         body_len = len(body)
-        body_hash = sha256_bytes(body)
+        body_hash = sha256_bytes(body) if body else _EMPTY_SHA256
     elif body_files:
         total_len = 0
         hasher = hashlib.sha256()
@@ -115,6 +115,7 @@ def run_libtest_case(
     download_files: Optional[List[Path]] = None,
     download_count: Optional[int] = None,
     allowed_exit_codes: Optional[Set[int]] = None,
+    persist: bool = True,
 ) -> Dict:
     """
     运行 libcurl baseline 用例并返回 artifacts 结构。
@@ -124,6 +125,8 @@ def run_libtest_case(
     - request_meta/response_meta：由调用方填充 method/url/headers/http_version/status 等
     - download_files：下载场景传入文件路径以计算 len/hash
     - download_count：如未传 download_files，可按 LocalClient 规则自动收集 download_{i}.data
+    - persist：为 False 时不落盘，由调用方回填观测字段后统一 write_json（避免同一 artifacts 写两次）；
+      失败路径须用 write_results 留存已有结果
     """
     client = LocalClient(env=env, name=client_name)
     cmd_args = args or []
@@ -277,6 +280,7 @@ def run_libtest_case(
             url=request_meta["url"],
             headers=request_meta.get("headers"),
             body=request_meta.get("body"),
+            body_sha256=request_meta.get("body_sha256"),
         )
     resp_summary = None
     if response_meta:
@@ -306,5 +310,6 @@ def run_libtest_case(
     }
     root = artifacts_root(env)
     path = artifact_path(root, suite=suite, case=case, flavor="baseline")
-    write_json(path, payload)
+    if persist:
+        write_json(path, payload)
     return {"path": path, "payload": payload}
@@ -8,11 +8,12 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Dict, List, Tuple
-import json
+
+from .artifacts import read_json
 
 
 def _load(path: Path) -> Dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return read_json(path)
 
 def _find_event(events: List[Dict], event_type: str) -> Dict:
     for e in events or []:
@@ -232,8 +233,13 @@ def compare_artifacts(baseline_path: Path, qcurl_path: Path) -> Tuple[bool, List
     比较 baseline 与 QCurl artifacts。返回 (是否一致, 差异列表)。
     - 仅比较双方都存在的字段；缺失视为差异。
     """
-    base = _load(baseline_path)
-    qc = _load(qcurl_path)
+    return compare_payloads(_load(baseline_path), _load(qcurl_path))
+
+
+def compare_payloads(base: Dict, qc: Dict) -> Tuple[bool, List[str]]:
+    """
+    与 compare_artifacts 口径相同，但直接比较内存中的 payload（省去落盘后再读回解析）。
+    """
     diffs: List[str] = []
 
     # 请求语义摘要（P0 必做）
@@ -442,3 +448,11 @@ def assert_artifacts_match(baseline_path: Path, qcurl_path: Path) -> None:
     if not ok:
         detail = "\n".join(diffs)
         raise AssertionError(f"Artifacts mismatch:\n{detail}")
+
+
+def assert_payloads_match(baseline_payload: Dict, qcurl_payload: Dict) -> None:
+    """同 assert_artifacts_match，但比较内存中的 payload；调用方仍负责 write_json 留存证据。"""
+    ok, diffs = compare_payloads(baseline_payload, qcurl_payload)
+    if not ok:
+        detail = "\n".join(diffs)
+        raise AssertionError(f"Artifacts mismatch:\n{detail}")
@@ -0,0 +1,34 @@
+"""
+用例 trace id 生成。
+
+每个用例都需要一段短随机十六进制串来区分 baseline/qcurl 请求（req_id）；
+这里一次读取一批随机字节按需切片，避免每个用例各自构造 uuid4 并触发一次 getrandom。
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+_POOL_BYTES = 4096
+_TRACE_ID_BYTES = 4
+
+_lock = threading.Lock()
+_pool = b""
+_offset = 0
+_pool_pid = 0
+
+
+def trace_id() -> str:
+    """返回 8 位十六进制随机串（熵与 uuid4().hex[:8] 相同，32 bit）。"""
+    global _pool, _offset, _pool_pid
+    with _lock:
+        pid = os.getpid()
+        # fork 后的子进程（如 xdist worker）必须重新取随机字节，否则会与父进程产生相同序列
+        if pid != _pool_pid or _offset + _TRACE_ID_BYTES > len(_pool):
+            _pool = os.urandom(_POOL_BYTES)
+            _offset = 0
+            _pool_pid = pid
+        chunk = _pool[_offset : _offset + _TRACE_ID_BYTES]
+        _offset += _TRACE_ID_BYTES
+    return chunk.hex()
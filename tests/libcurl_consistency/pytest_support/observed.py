@@ -11,8 +11,10 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from tests.libcurl_consistency.pytest_support.urls import strip_query_id, strip_query_id_keep_origin
 
 
 _DEFAULT_OBSERVE_TIMEOUT_S = 2.0
@@ -72,21 +74,6 @@ class ObserveHttpObserved:
     body_sha256: str = ""
 
 
-def _strip_query_id(url: str) -> str:
-    parts = urlsplit(url)
-    q = parse_qs(parts.query, keep_blank_values=True)
-    q.pop("id", None)
-    query = urlencode(q, doseq=True)
-    return urlunsplit(("", "", parts.path, query, ""))
-
-def _strip_query_id_keep_origin(url: str) -> str:
-    parts = urlsplit(url)
-    q = parse_qs(parts.query, keep_blank_values=True)
-    q.pop("id", None)
-    query = urlencode(q, doseq=True)
-    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
-
-
 def _normalize_http_proto(proto: str) -> str:
     proto = proto.strip()
     if proto.startswith("HTTP/2"):
@@ -114,39 +101,52 @@ def parse_httpd_access_log(access_log: Path) -> List[Dict[str, str]]:
 
     entries: List[Dict[str, str]] = []
     for raw in access_log.read_text(encoding="utf-8", errors="replace").splitlines():
-        if not raw.strip():
-            continue
-        parts = raw.split("|")
-        if len(parts) != 7:
-            continue
-        ts, proto, method, url, status, range_v, cl_v = [p.strip() for p in parts]
-        u = urlsplit(url)
-        q = parse_qs(u.query)
-        req_id = q.get("id", [""])[0]
-        entries.append({
-            "ts": ts,
-            "proto": proto,
-            "method": method,
-            "url": url,
-            "status": status,
-            "range": range_v,
-            "content_length": cl_v,
-            "id": req_id,
-        })
+        e = _parse_httpd_access_line(raw)
+        if e is not None:
+            entries.append(e)
     return entries
 
 
+def _parse_httpd_access_line(raw: str) -> Optional[Dict[str, str]]:
+    if not raw.strip():
+        return None
+    parts = raw.split("|")
+    if len(parts) != 7:
+        return None
+    ts, proto, method, url, status, range_v, cl_v = [p.strip() for p in parts]
+    u = urlsplit(url)
+    q = parse_qs(u.query)
+    req_id = q.get("id", [""])[0]
+    return {
+        "ts": ts,
+        "proto": proto,
+        "method": method,
+        "url": url,
+        "status": status,
+        "range": range_v,
+        "content_length": cl_v,
+        "id": req_id,
+    }
+
+
 def httpd_observed_for_id(access_log: Path,
                           req_id: str,
                           *,
                           require_range: bool,
-                          include_content_length: bool = True) -> HttpdObserved:
+                          include_content_length: bool = True,
+                          index: Optional[AccessLogIndex] = None) -> HttpdObserved:
+    def _entries() -> List[Dict[str, str]]:
+        # index（见 AccessLogIndex）存在时只增量读取新追加的行，避免每次轮询全量重扫
+        if index is not None:
+            return index.entries_for_id(req_id)
+        return [e for e in parse_httpd_access_log(access_log) if e.get("id") == req_id]
+
     # ⚠️ 注意：httpd/nghttpx 的 access_log 写入存在 flush 延迟（尤其是 CONNECT + h2 场景）。
     # 为避免“请求已完成但日志尚未落盘”导致的假失败，这里做短暂轮询等待。
     deadline = time.time() + _observe_timeout_s()
     entries: List[Dict[str, str]] = []
     while time.time() < deadline:
-        entries = [e for e in parse_httpd_access_log(access_log) if e.get("id") == req_id]
+        entries = _entries()
         if entries:
             break
         time.sleep(0.05)
@@ -168,7 +168,7 @@ def httpd_observed_for_id(access_log: Path,
             if chosen is not None and any(not has_range(e) for e in entries):
                 break
             time.sleep(0.05)
-            entries = [e for e in parse_httpd_access_log(access_log) if e.get("id") == req_id]
+            entries = _entries()
         if chosen is None:
             raise AssertionError(f"httpd access_log 未观察到 Range 请求：id={req_id}")
         if not any(not has_range(e) for e in entries):
@@ -187,7 +187,7 @@ def httpd_observed_for_id(access_log: Path,
 
     return HttpdObserved(
         method=(chosen.get("method") or "").upper(),
-        url=_strip_query_id(chosen.get("url") or ""),
+        url=strip_query_id(chosen.get("url") or ""),
         http_version=_normalize_http_proto(chosen.get("proto") or ""),
         status=int(chosen.get("status") or "0"),
         headers=headers,
@@ -227,7 +227,7 @@ def httpd_observed_list_for_id(access_log: Path,
                 headers["content-length"] = cl_v
         observed.append(HttpdObserved(
             method=(e.get("method") or "").upper(),
-            url=_strip_query_id(e.get("url") or ""),
+            url=strip_query_id(e.get("url") or ""),
             http_version=_normalize_http_proto(e.get("proto") or ""),
             status=int(e.get("status") or "0"),
             headers=headers,
@@ -246,37 +246,107 @@ def parse_nghttpx_access_log(access_log: Path) -> List[Dict[str, str]]:
 
     entries: List[Dict[str, str]] = []
     for raw in access_log.read_text(encoding="utf-8", errors="replace").splitlines():
-        if not raw.strip():
-            continue
-        parts = raw.split("|")
-        if len(parts) != 7:
-            continue
-        ts, alpn, method, path, status, range_v, cl_v = [p.strip() for p in parts]
-        u = urlsplit(path)
-        q = parse_qs(u.query)
-        req_id = q.get("id", [""])[0]
-        entries.append({
-            "ts": ts,
-            "alpn": alpn,
-            "method": method,
-            "path": path,
-            "status": status,
-            "range": range_v,
-            "content_length": cl_v,
-            "id": req_id,
-        })
+        e = _parse_nghttpx_access_line(raw)
+        if e is not None:
+            entries.append(e)
     return entries
 
 
+def _parse_nghttpx_access_line(raw: str) -> Optional[Dict[str, str]]:
+    if not raw.strip():
+        return None
+    parts = raw.split("|")
+    if len(parts) != 7:
+        return None
+    ts, alpn, method, path, status, range_v, cl_v = [p.strip() for p in parts]
+    u = urlsplit(path)
+    q = parse_qs(u.query)
+    req_id = q.get("id", [""])[0]
+    return {
+        "ts": ts,
+        "alpn": alpn,
+        "method": method,
+        "path": path,
+        "status": status,
+        "range": range_v,
+        "content_length": cl_v,
+        "id": req_id,
+    }
+
+
+class AccessLogIndex:
+    """
+    access_log 增量索引：只读取上次之后追加的字节，每行解析一次并按 id 建索引。
+    - 适用于同一会话内对同一 access_log 反复按 id 查询的场景（避免每次全量重扫）
+    - 文件被截断/轮转（size 变小）或被删除后重建（inode/dev 变化）时自动重建
+    """
+
+    def __init__(self, access_log: Path, parse_line: Callable[[str], Optional[Dict[str, str]]]) -> None:
+        self.access_log = access_log
+        self._parse_line = parse_line
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._pending = b""
+        self._by_id: Dict[str, List[Dict[str, str]]] = {}
+
+    def refresh(self) -> None:
+        try:
+            st = self.access_log.stat()
+        except FileNotFoundError:
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            self._file_id = file_id
+            self._offset = 0
+            self._pending = b""
+            self._by_id.clear()
+        if st.st_size == self._offset:
+            return
+        with self.access_log.open("rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        self._offset += len(data)
+        data = self._pending + data
+        # 最后一行可能尚未写完（无换行），留到下次 refresh 再解析
+        complete, sep, tail = data.rpartition(b"\n")
+        if not sep:
+            self._pending = data
+            return
+        self._pending = tail
+        for raw in complete.decode("utf-8", errors="replace").splitlines():
+            e = self._parse_line(raw)
+            if e is not None:
+                self._by_id.setdefault(e.get("id") or "", []).append(e)
+
+    def entries_for_id(self, req_id: str) -> List[Dict[str, str]]:
+        self.refresh()
+        return list(self._by_id.get(req_id, []))
+
+
+def httpd_access_log_index(access_log: Path) -> AccessLogIndex:
+    return AccessLogIndex(access_log, _parse_httpd_access_line)
+
+
+def nghttpx_access_log_index(access_log: Path) -> AccessLogIndex:
+    return AccessLogIndex(access_log, _parse_nghttpx_access_line)
+
+
 def nghttpx_observed_for_id(access_log: Path,
                             req_id: str,
                             *,
                             require_range: bool,
-                            include_content_length: bool = True) -> HttpdObserved:
+                            include_content_length: bool = True,
+                            index: Optional[AccessLogIndex] = None) -> HttpdObserved:
+    def _entries() -> List[Dict[str, str]]:
+        # index（见 AccessLogIndex）存在时只增量读取新追加的行，避免每次轮询全量重扫
+        if index is not None:
+            return index.entries_for_id(req_id)
+        return [e for e in parse_nghttpx_access_log(access_log) if e.get("id") == req_id]
+
     deadline = time.time() + _observe_timeout_s()
     entries: List[Dict[str, str]] = []
     while time.time() < deadline:
-        entries = [e for e in parse_nghttpx_access_log(access_log) if e.get("id") == req_id]
+        entries = _entries()
         if entries:
             break
         time.sleep(0.05)
@@ -298,7 +368,7 @@ def nghttpx_observed_for_id(access_log: Path,
             if chosen is not None and any(not has_range(e) for e in entries):
                 break
             time.sleep(0.05)
-            entries = [e for e in parse_nghttpx_access_log(access_log) if e.get("id") == req_id]
+            entries = _entries()
         if chosen is None:
             raise AssertionError(f"nghttpx access_log 未观察到 Range 请求：id={req_id}")
         if not any(not has_range(e) for e in entries):
@@ -317,7 +387,7 @@ def nghttpx_observed_for_id(access_log: Path,
 
     return HttpdObserved(
         method=(chosen.get("method") or "").upper(),
-        url=_strip_query_id(chosen.get("path") or ""),
+        url=strip_query_id(chosen.get("path") or ""),
         http_version=_normalize_alpn_proto(chosen.get("alpn") or ""),
         status=int(chosen.get("status") or "0"),
         headers=headers,
@@ -356,7 +426,7 @@ def nghttpx_observed_list_for_id(access_log: Path,
                 headers["content-length"] = cl_v
         observed.append(HttpdObserved(
             method=(e.get("method") or "").upper(),
-            url=_strip_query_id(e.get("path") or ""),
+            url=strip_query_id(e.get("path") or ""),
             http_version=_normalize_alpn_proto(e.get("alpn") or ""),
             status=int(e.get("status") or "0"),
             headers=headers,
@@ -388,27 +458,42 @@ def ws_observed_for_id(handshake_log: Path, req_id: str) -> WsObserved:
     headers = {str(k).lower(): str(v) for k, v in headers_in.items()}
     return WsObserved(
         method="GET",
-        url=_strip_query_id(path),
+        url=strip_query_id(path),
         headers=headers,
     )
 
 
-def parse_proxy_log(path: Path) -> List[Dict]:
+def _parse_jsonl_log(path: Path, start_offset: int, req_id: Optional[str] = None) -> List[Dict]:
+    """
+    - req_id：按原始字节子串预筛，仅对可能匹配的行做 json 解析；精确匹配仍由调用方比较 `id` 字段
+    """
     if not path.exists():
         return []
+    with path.open("rb") as f:
+        if start_offset > 0:
+            f.seek(start_offset)
+        data = f.read()
+    needle = req_id.encode("utf-8") if req_id else b""
     out: List[Dict] = []
-    for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
-        if not raw.strip():
+    for raw in data.splitlines():
+        if needle not in raw or not raw.strip():
             continue
         try:
-            out.append(json.loads(raw))
+            out.append(json.loads(raw.decode("utf-8", errors="replace")))
         except json.JSONDecodeError:
             continue
     return out
 
 
-def proxy_observed_for_log(proxy_log: Path, *, method: str) -> ProxyObserved:
-    entries = parse_proxy_log(proxy_log)
+def parse_proxy_log(path: Path, *, start_offset: int = 0, req_id: Optional[str] = None) -> List[Dict]:
+    return _parse_jsonl_log(path, start_offset, req_id)
+
+
+def proxy_observed_for_log(proxy_log: Path, *, method: str, start_offset: int = 0) -> ProxyObserved:
+    """
+    - start_offset：只扫描该偏移之后追加的记录（见 observe_log_offset）
+    """
+    entries = parse_proxy_log(proxy_log, start_offset=start_offset)
     want = method.upper()
     for e in entries:
         if str(e.get("method") or "").upper() != want:
@@ -425,7 +510,7 @@ def proxy_observed_for_log(proxy_log: Path, *, method: str) -> ProxyObserved:
                 headers_allowlist[name] = v
         url = target
         if want != "CONNECT":
-            url = _strip_query_id_keep_origin(target)
+            url = strip_query_id_keep_origin(target)
         return ProxyObserved(
             method=want,
             url=url,
@@ -434,36 +519,39 @@ def proxy_observed_for_log(proxy_log: Path, *, method: str) -> ProxyObserved:
     raise AssertionError(f"proxy log 无匹配记录：method={want}, file={proxy_log}")
 
 
-def parse_observe_http_log(path: Path) -> List[Dict]:
-    if not path.exists():
-        return []
-    out: List[Dict] = []
-    for raw in path.read_text(encoding="utf-8", errors="replace").splitlines():
-        if not raw.strip():
-            continue
-        try:
-            out.append(json.loads(raw))
-        except json.JSONDecodeError:
-            continue
-    return out
+def observe_log_offset(path: Path) -> int:
+    """
+    返回 observe/proxy log 当前末尾偏移，作为后续请求的读取窗口起点。
+    - 替代 write_text("") 截断：服务端可能仍在追加写入，截断会与其竞争；按窗口读取只依赖追加语义
+    """
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def parse_observe_http_log(path: Path, *, start_offset: int = 0, req_id: Optional[str] = None) -> List[Dict]:
+    return _parse_jsonl_log(path, start_offset, req_id)
 
 
 def _wait_for_observe_http_matches(observe_log: Path,
                                   req_id: str,
                                   *,
                                   expected_count: int,
-                                  timeout_s: Optional[float] = None) -> List[Dict]:
+                                  timeout_s: Optional[float] = None,
+                                  start_offset: int = 0) -> List[Dict]:
     """
     等待 observe_http.jsonl 写入完成，避免“服务端线程写 log”与“测试线程读 log”之间的竞态导致偶发空读。
     - expected_count > 0：等待匹配条数恰好等于 expected_count
     - expected_count <= 0：等待至少出现 1 条匹配记录
+    - start_offset：只扫描该偏移之后追加的记录（见 observe_log_offset）
     """
     if timeout_s is None:
         timeout_s = _observe_timeout_s()
     end = time.monotonic() + max(0.0, float(timeout_s))
     last: List[Dict] = []
     while True:
-        entries = parse_observe_http_log(observe_log)
+        entries = parse_observe_http_log(observe_log, start_offset=start_offset, req_id=req_id)
         last = [e for e in entries if (e.get("id") or "") == req_id]
         if expected_count > 0:
             if len(last) == expected_count:
@@ -477,8 +565,8 @@ def _wait_for_observe_http_matches(observe_log: Path,
         time.sleep(0.01)
 
 
-def observe_http_observed_for_id(observe_log: Path, req_id: str) -> ObserveHttpObserved:
-    matches = _wait_for_observe_http_matches(observe_log, req_id, expected_count=0)
+def observe_http_observed_for_id(observe_log: Path, req_id: str, *, start_offset: int = 0) -> ObserveHttpObserved:
+    matches = _wait_for_observe_http_matches(observe_log, req_id, expected_count=0, start_offset=start_offset)
     if not matches:
         raise AssertionError(f"observe http log 无匹配记录：id={req_id}")
     e = matches[0]
@@ -489,12 +577,12 @@ def observe_http_observed_for_id(observe_log: Path, req_id: str) -> ObserveHttpO
     if "location" in resp_headers:
         loc = resp_headers.get("location") or ""
         if loc.startswith("http://") or loc.startswith("https://"):
-            resp_headers["location"] = _strip_query_id_keep_origin(loc)
+            resp_headers["location"] = strip_query_id_keep_origin(loc)
         else:
-            resp_headers["location"] = _strip_query_id(loc)
+            resp_headers["location"] = strip_query_id(loc)
     return ObserveHttpObserved(
         method=str(e.get("method") or "").upper(),
-        url=_strip_query_id(str(e.get("path") or "")),
+        url=strip_query_id(str(e.get("path") or "")),
         status=int(e.get("status") or "0"),
         headers=headers,
         headers_raw_lines=[str(v) for v in (e.get("headers_raw_lines") or [])],
@@ -508,12 +596,15 @@ def observe_http_observed_for_id(observe_log: Path, req_id: str) -> ObserveHttpO
 def observe_http_observed_list_for_id(observe_log: Path,
                                      req_id: str,
                                      *,
-                                     expected_count: int) -> List[ObserveHttpObserved]:
+                                     expected_count: int,
+                                     start_offset: int = 0) -> List[ObserveHttpObserved]:
     """
     返回同一 correlation id 下的所有 HTTP 观测记录（来自 http_observe_server.py JSONL）。
     - 保留写入顺序（用于重定向/登录态等“序列语义”场景）
     """
-    matches = _wait_for_observe_http_matches(observe_log, req_id, expected_count=expected_count)
+    matches = _wait_for_observe_http_matches(
+        observe_log, req_id, expected_count=expected_count, start_offset=start_offset
+    )
     if not matches:
         raise AssertionError(f"observe http log 无匹配记录：id={req_id}")
     if expected_count > 0 and len(matches) != expected_count:
@@ -530,12 +621,12 @@ def observe_http_observed_list_for_id(observe_log: Path,
         if "location" in resp_headers:
             loc = resp_headers.get("location") or ""
             if loc.startswith("http://") or loc.startswith("https://"):
-                resp_headers["location"] = _strip_query_id_keep_origin(loc)
+                resp_headers["location"] = strip_query_id_keep_origin(loc)
             else:
-                resp_headers["location"] = _strip_query_id(loc)
+                resp_headers["location"] = strip_query_id(loc)
         out.append(ObserveHttpObserved(
             method=str(e.get("method") or "").upper(),
-            url=_strip_query_id(str(e.get("path") or "")),
+            url=strip_query_id(str(e.get("path") or "")),
             status=int(e.get("status") or "0"),
             headers=headers,
             headers_raw_lines=[str(v) for v in (e.get("headers_raw_lines") or [])],
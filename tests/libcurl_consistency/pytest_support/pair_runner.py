@@ -0,0 +1,67 @@
+"""
+baseline/qcurl 成对执行：
+- 两侧使用不同 req_id 且各自独立的运行目录，可并发执行以缩短单用例墙钟时间。
+- 排查竞态时可通过环境变量强制串行：QCURL_LC_SERIAL_RUNS=1
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NoReturn, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+# run_pair 失败时挂在异常上的 (baseline, qcurl)：未完成/失败的一侧为 None
+_PAIR_RESULTS_ATTR = "lc_pair_results"
+
+
+def should_run_serially() -> bool:
+    return os.environ.get("QCURL_LC_SERIAL_RUNS", "").strip() == "1"
+
+
+def _raise_with_results(exc: BaseException, baseline: Optional[T], qcurl: Optional[U]) -> NoReturn:
+    setattr(exc, _PAIR_RESULTS_ATTR, (baseline, qcurl))
+    raise exc
+
+
+def run_pair(baseline_fn: Callable[[], T], qcurl_fn: Callable[[], U]) -> Tuple[T, U]:
+    """
+    执行 baseline 与 qcurl 两侧并返回 (baseline, qcurl)。
+    - 并发模式下等待两侧都结束后再上抛异常（baseline 优先），与串行执行的失败口径一致
+    - 已完成一侧的结果挂在异常上，调用方可经 pair_results 取回并留存 artifacts
+    """
+    if should_run_serially():
+        baseline = None
+        try:
+            baseline = baseline_fn()
+            return baseline, qcurl_fn()
+        except Exception as exc:
+            _raise_with_results(exc, baseline, None)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        baseline_future = pool.submit(baseline_fn)
+        qcurl_future = pool.submit(qcurl_fn)
+        baseline_exc = baseline_future.exception()
+        qcurl_exc = qcurl_future.exception()
+    if baseline_exc is not None:
+        _raise_with_results(baseline_exc, None, None if qcurl_exc is not None else qcurl_future.result())
+    if qcurl_exc is not None:
+        _raise_with_results(qcurl_exc, baseline_future.result(), None)
+    return baseline_future.result(), qcurl_future.result()
+
+
+def pair_results(exc: BaseException, baseline: Optional[T], qcurl: Optional[U]) -> Tuple[Optional[T], Optional[U]]:
+    """
+    失败路径取回 (baseline, qcurl)：异常（含 __cause__/__context__ 链）来自 run_pair 时返回其挂载的结果，
+    否则沿用调用方变量。
+    """
+    seen = set()
+    cur: Optional[BaseException] = exc
+    while cur is not None and id(cur) not in seen:
+        seen.add(id(cur))
+        results = getattr(cur, _PAIR_RESULTS_ATTR, None)
+        if results is not None:
+            return results
+        cur = cur.__cause__ or cur.__context__
+    return baseline, qcurl
@@ -8,8 +8,9 @@ import os
 import re
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
 from testenv import Env  # type: ignore
 
@@ -24,16 +25,22 @@ from .artifacts import (
 )
 
 
-def require_qcurl_qttest() -> Path:
-    raw = (os.environ.get("QCURL_QTTEST") or "").strip()
-    if not raw:
-        raise RuntimeError("QCURL_QTTEST missing from gate environment")
+@lru_cache(maxsize=4)
+def _resolve_qttest(raw: str) -> Path:
+    # 只缓存成功结果（lru_cache 不缓存异常）；同一会话内 QCURL_QTTEST 不会变化，无需每个用例重复 resolve/stat。
     path = Path(raw).expanduser().resolve()
     if not path.exists():
         raise FileNotFoundError(f"Qt Test binary not found: {path}")
     return path
 
 
+def require_qcurl_qttest() -> Path:
+    raw = (os.environ.get("QCURL_QTTEST") or "").strip()
+    if not raw:
+        raise RuntimeError("QCURL_QTTEST missing from gate environment")
+    return _resolve_qttest(raw)
+
+
 def _collect_download_files(run_dir: Path, count: int) -> List[Path]:
     return [run_dir / f"download_{i}.data" for i in range(count)]
 
@@ -58,7 +65,8 @@ def run_qt_test(
     response_meta: Optional[Dict] = None,
     download_files: Optional[List[Path]] = None,
     download_count: Optional[int] = None,
-    case_env: Optional[Dict[str, str]] = None,
+    case_env: Optional[Mapping[str, str]] = None,
+    persist: bool = True,
 ) -> Dict:
     """
     执行 Qt Test 可执行，生成 QCurl artifacts。
@@ -66,6 +74,7 @@ def run_qt_test(
     - args：传给 Qt Test 的参数（如 gtest filter/自定义输出路径）
     - request_meta/response_meta：Qt Test 侧填充 method/url/headers/http_version/status 等
     - download_files：下载场景传入文件路径以计算 len/hash
+    - persist：为 False 时不落盘，由调用方回填观测字段后统一 write_json；失败路径须用 write_results 留存已有结果
     """
     qt_executable = qt_executable.expanduser().resolve()
     if not qt_executable.exists():
@@ -114,6 +123,7 @@ def run_qt_test(
             url=request_meta["url"],
             headers=request_meta.get("headers"),
             body=request_meta.get("body"),
+            body_sha256=request_meta.get("body_sha256"),
         )
     resp_summary = None
     if response_meta:
@@ -146,5 +156,6 @@ def run_qt_test(
         "stderr": proc.stderr.splitlines(),
     }
     path = artifact_path(root, suite=suite, case=case, flavor="qcurl")
-    write_json(path, payload)
+    if persist:
+        write_json(path, payload)
     return {"path": path, "payload": payload}
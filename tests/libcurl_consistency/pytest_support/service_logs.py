@@ -8,11 +8,14 @@ from __future__ import annotations
 
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
 
+@lru_cache(maxsize=1)
 def should_collect_service_logs() -> bool:
+    # 开关由 run_gate/调用方在进程启动前设置，会话内不变：只解析一次
     return os.environ.get("QCURL_LC_COLLECT_LOGS", "").strip() == "1"
 
 
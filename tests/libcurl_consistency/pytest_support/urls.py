@@ -0,0 +1,44 @@
+"""
+用例 URL 拼接辅助。
+
+各用例通过 query 中的 `id=<req_id>` 关联服务端日志与 baseline/qcurl 请求，
+这里统一拼接/剥离规则，避免每个用例模块各自维护一份副本。
+剥离结果按原始 URL 缓存：同一请求目标会在 baseline/qcurl 两侧与多次日志轮询中重复出现。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from urllib.parse import SplitResult, parse_qs, urlencode, urlsplit, urlunsplit
+
+
+def append_req_id(url: str, req_id: str) -> str:
+    """
+    在 URL 末尾追加 `id=<req_id>`。
+    - 以 `?`/`&` 结尾的 URL（用例内预先锚定 query）直接拼接
+    - 其余按是否已有 query 选择 `&` 或 `?`
+    """
+    if url.endswith(("?", "&")):
+        return f"{url}id={req_id}"
+    sep = "&" if "?" in url else "?"
+    return f"{url}{sep}id={req_id}"
+
+
+@lru_cache(maxsize=512)
+def _split_without_id(url: str) -> tuple[SplitResult, str]:
+    parts = urlsplit(url)
+    q = parse_qs(parts.query, keep_blank_values=True)
+    q.pop("id", None)
+    return parts, urlencode(q, doseq=True)
+
+
+def strip_query_id(url: str) -> str:
+    """去掉 query 中的 `id`，仅保留 path+query（服务端日志中的请求目标口径）。"""
+    parts, query = _split_without_id(url)
+    return urlunsplit(("", "", parts.path, query, ""))
+
+
+def strip_query_id_keep_origin(url: str) -> str:
+    """去掉 query 中的 `id`，保留 scheme/netloc/fragment（proxy 绝对 URI 口径）。"""
+    parts, query = _split_without_id(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from tests.libcurl_consistency.pytest_support.compare import compare_artifacts
+from tests.libcurl_consistency.pytest_support.compare import compare_artifacts, compare_payloads
 
 
 def _payload() -> dict[str, object]:
@@ -170,3 +170,17 @@ def test_backpressure_and_upload_pause_resume_require_expected_schema(tmp_path)
     assert not ok
     assert "qcurl backpressure_contract.schema mismatch: 'wrong'" in diffs
     assert "qcurl upload_pause_resume.zero_read_count invalid: 0" in diffs
+
+
+def test_in_memory_payload_compare_matches_artifact_compare(tmp_path) -> None:
+    baseline = _payload()
+    qcurl = _payload()
+    qcurl["response"]["headers_raw_sha256"] = "other"  # type: ignore[index]
+
+    left = tmp_path / "baseline.json"
+    right = tmp_path / "qcurl.json"
+    _write(left, baseline)
+    _write(right, qcurl)
+
+    assert compare_payloads(baseline, qcurl) == compare_artifacts(left, right)
+    assert compare_payloads(baseline, _payload()) == (True, [])
@@ -14,17 +14,13 @@ import pytest
 
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("该扩展用例仅在 QCURL_LC_EXT=1 时启用", allow_module_level=True)
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 @pytest.mark.parametrize("status_code", [200, 418])
 def test_ext_api_reported_status(status_code, env, lc_observe_http):
     qt_bin = os.environ.get("QCURL_QTTEST")
@@ -33,12 +29,12 @@ def test_ext_api_reported_status(status_code, env, lc_observe_http):
         pytest.skip("当前环境未提供 QCURL_QTTEST 可执行文件，跳过该用例")
 
     observe_port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     trace_base = f"lc_{uuid.uuid4().hex[:8]}_ext_api_reported_status_{status_code}"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    url = _append_req_id(f"http://localhost:{observe_port}/status/{status_code}", qcurl_req_id)
+    url = append_req_id(f"http://localhost:{observe_port}/status/{status_code}", qcurl_req_id)
     req_meta = {"method": "GET", "url": url, "headers": {}, "body": b""}
     resp_meta = {"status": status_code, "http_version": "http/1.1", "headers": {}, "body": None}
 
@@ -20,17 +20,13 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import nghttpx_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("HTTP/3 success coverage is ext-only", allow_module_level=True)
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def test_ext_http3_success_h3(env, lc_logs):
     guard_planned_test("test_ext_http3_success_h3.py")
     if not env.have_h3():
@@ -50,8 +46,8 @@ def test_ext_http3_success_h3(env, lc_logs):
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    baseline_url = _append_req_id(f"https://localhost:{env.https_port}/data-1m", baseline_req_id)
-    qcurl_url = _append_req_id(f"https://localhost:{env.https_port}/data-1m", qcurl_req_id)
+    baseline_url = append_req_id(f"https://localhost:{env.https_port}/data-1m", baseline_req_id)
+    qcurl_url = append_req_id(f"https://localhost:{env.https_port}/data-1m", qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
     try:
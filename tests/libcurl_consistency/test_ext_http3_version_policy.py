@@ -11,53 +11,34 @@ Http3Only failure.
 from __future__ import annotations
 
 import os
-import re
 import uuid
 from pathlib import Path
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import (
+    apply_error_namespaces,
+    build_request_semantic,
+    parse_curlcode_http_code,
+    write_json,
+)
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.capability_manifest import guard_planned_test
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
+from tests.libcurl_consistency.pytest_support.urls import append_req_id, strip_query_id_keep_origin
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("HTTP/3 version policy is ext-only", allow_module_level=True)
 
 
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
-def _strip_query_id(url: str) -> str:
-    parts = urlsplit(url)
-    query = parse_qs(parts.query, keep_blank_values=True)
-    query.pop("id", None)
-    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query, doseq=True), parts.fragment))
-
-
 def _normalize_error_request(payload: dict, url: str) -> None:
     request = payload.get("request")
     if isinstance(request, dict):
-        request["url"] = _strip_query_id(url)
+        request["url"] = strip_query_id_keep_origin(url)
 
 
 def _normalize_empty_error_response(payload: dict) -> None:
@@ -76,7 +57,7 @@ def test_ext_http3_fallback_and_only_failure_http_1_1(env, lc_logs, lc_observe_h
         pytest.skip("当前环境未提供 QCURL_QTTEST 可执行文件，跳过该用例")
 
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
     suite = "ext_http3_version_policy"
     proto = "http/1.1"
 
@@ -91,8 +72,8 @@ def test_ext_http3_fallback_and_only_failure_http_1_1(env, lc_logs, lc_observe_h
         baseline_req_id = f"{trace_base}__baseline"
         qcurl_req_id = f"{trace_base}__qcurl"
         url = f"http://localhost:{port}/empty_200"
-        baseline_url = _append_req_id(url, baseline_req_id)
-        qcurl_url = _append_req_id(url, qcurl_req_id)
+        baseline_url = append_req_id(url, baseline_req_id)
+        qcurl_url = append_req_id(url, qcurl_req_id)
         resp_meta = {"status": 0 if expected_error else 200, "http_version": proto, "headers": {}, "body": None}
 
         observe_log.write_text("", encoding="utf-8")
@@ -108,7 +89,7 @@ def test_ext_http3_fallback_and_only_failure_http_1_1(env, lc_logs, lc_observe_h
             allowed_exit_codes={0, 7},
         )
         if expected_error:
-            curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+            curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
             apply_error_namespaces(
                 baseline["payload"],
                 kind="protocol",
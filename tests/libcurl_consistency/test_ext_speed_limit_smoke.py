@@ -6,40 +6,29 @@
 from __future__ import annotations
 
 import os
-import re
 import uuid
 from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import (
+    apply_error_namespaces,
+    build_request_semantic,
+    parse_curlcode_http_code,
+    write_json,
+)
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("该扩展用例仅在 QCURL_LC_EXT=1 时启用", allow_module_level=True)
 
 
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def test_ext_speed_limit_smoke_http_1_1(env, lc_logs, lc_observe_http):
     qt_bin = os.environ.get("QCURL_QTTEST")
     qt_path = Path(qt_bin).resolve() if qt_bin else None
@@ -48,7 +37,7 @@ def test_ext_speed_limit_smoke_http_1_1(env, lc_logs, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "ext_speed_limit"
     proto = "http/1.1"
@@ -62,8 +51,8 @@ def test_ext_speed_limit_smoke_http_1_1(env, lc_logs, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/slow_body/131072/4096/50"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -91,7 +80,7 @@ def test_ext_speed_limit_smoke_http_1_1(env, lc_logs, lc_observe_http):
             allowed_exit_codes={0, 7},
         )
 
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         assert curlcode == 42, f"baseline curlcode 期望为 42（ABORTED_BY_CALLBACK），实际为 {curlcode}"
 
         obs = observe_http_observed_for_id(observe_log, baseline_req_id)
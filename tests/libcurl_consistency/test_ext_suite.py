@@ -10,7 +10,6 @@ import os
 import uuid
 from pathlib import Path
 from typing import Dict, List
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import pytest
 
@@ -26,6 +25,7 @@ from tests.libcurl_consistency.pytest_support.observed import (
 )
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id, strip_query_id
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
@@ -36,17 +36,6 @@ def _fmt_args(template: List[str], defaults: Dict) -> List[str]:
     return [str(x).format(**defaults) for x in template]
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-def _strip_query_id(path_or_url: str) -> str:
-    parts = urlsplit(path_or_url)
-    q = parse_qs(parts.query, keep_blank_values=True)
-    q.pop("id", None)
-    query = urlencode(q, doseq=True)
-    return urlunsplit(("", "", parts.path, query, ""))
-
 def _load_jsonl(path: Path) -> List[Dict]:
     if not path.exists():
         return []
@@ -142,7 +131,7 @@ def test_ext_suite(case_id, env, lc_logs, tmp_path):
             resolved_defaults["url"] = str(resolved_defaults["url"]).format(
                 https_port=env.https_port,
             )
-            resolved_defaults["url"] = _append_req_id(resolved_defaults["url"], baseline_req_id)
+            resolved_defaults["url"] = append_req_id(resolved_defaults["url"], baseline_req_id)
         if "url_prefix" in resolved_defaults:
             resolved_defaults["url_prefix"] = str(resolved_defaults["url_prefix"]).format(
                 https_port=env.https_port,
@@ -151,7 +140,7 @@ def test_ext_suite(case_id, env, lc_logs, tmp_path):
         args = _fmt_args(case["args_template"], resolved_defaults)
         req_url = resolved_defaults.get("url")
         if not req_url and resolved_defaults.get("url_prefix"):
-            req_url = _append_req_id(f"{resolved_defaults['url_prefix']}0001", baseline_req_id)
+            req_url = append_req_id(f"{resolved_defaults['url_prefix']}0001", baseline_req_id)
         req_meta = {
             "method": "GET",
             "url": req_url,
@@ -325,7 +314,7 @@ def test_ext_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, tmp_path):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "ext"
     proto = "http/1.1"
@@ -337,8 +326,8 @@ def test_ext_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/empty_200"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
     try:
@@ -366,7 +355,7 @@ def test_ext_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, tmp_path):
         b0 = b_entries[0]
         baseline["payload"]["request"] = build_request_semantic(
             str(b0.get("method") or "GET"),
-            _strip_query_id(str(b0.get("path") or "")),
+            strip_query_id(str(b0.get("path") or "")),
             b0.get("headers") or {},
             b"",
         )
@@ -401,7 +390,7 @@ def test_ext_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, tmp_path):
         q0 = q_entries[0]
         qcurl["payload"]["request"] = build_request_semantic(
             str(q0.get("method") or "GET"),
-            _strip_query_id(str(q0.get("path") or "")),
+            strip_query_id(str(q0.get("path") or "")),
             q0.get("headers") or {},
             b"",
         )
@@ -18,6 +18,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import ws_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 from tests.libcurl_consistency.pytest_support.ws_baseline import run_ws_baseline_case
 
 
@@ -25,11 +26,6 @@ if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("该扩展用例仅在 QCURL_LC_EXT=1 时启用", allow_module_level=True)
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def _default_ws_baseline_binary(qt_executable: Path) -> Path:
     return qt_executable.with_name("qcurl_lc_ws_baseline")
 
@@ -53,8 +49,8 @@ def test_ext_ws_suite(case_id, env, lc_logs, lc_ws_logs, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url_template = str(case["url"]).format(ws_port=env.ws_port)
-    baseline_url = _append_req_id(url_template, baseline_req_id)
-    qcurl_url = _append_req_id(url_template, qcurl_req_id)
+    baseline_url = append_req_id(url_template, baseline_req_id)
+    qcurl_url = append_req_id(url_template, qcurl_req_id)
 
     req_meta = {
         "method": "GET",
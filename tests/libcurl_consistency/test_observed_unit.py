@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Optional
+
+from tests.libcurl_consistency.pytest_support.observed import AccessLogIndex
+
+
+def _parse(raw: str) -> Optional[Dict[str, str]]:
+    parts = raw.split()
+    if len(parts) != 2:
+        return None
+    return {"id": parts[0], "value": parts[1]}
+
+
+def _append(path: Path, data: bytes) -> None:
+    with path.open("ab") as f:
+        f.write(data)
+
+
+def test_access_log_index_keeps_partial_line_across_chunks_without_newline(tmp_path) -> None:
+    log = tmp_path / "access_log"
+    index = AccessLogIndex(log, _parse)
+
+    for chunk in (b"a 1\nb_par", b"tial", b" 2\nc 3\n"):
+        _append(log, chunk)
+        index.refresh()
+
+    assert index.entries_for_id("a") == [{"id": "a", "value": "1"}]
+    assert index.entries_for_id("b_partial") == [{"id": "b_partial", "value": "2"}]
+    assert index.entries_for_id("c") == [{"id": "c", "value": "3"}]
+    assert index.entries_for_id("b_par") == []
+    assert index.entries_for_id("2") == []
+
+
+def test_access_log_index_rebuilds_when_file_is_replaced(tmp_path) -> None:
+    log = tmp_path / "access_log"
+    index = AccessLogIndex(log, _parse)
+    _append(log, b"old 1\n")
+    assert index.entries_for_id("old")
+
+    # 删除后重建且长度超过旧 offset：仅按 size 判定无法识别
+    keep = tmp_path / "keep"
+    log.rename(keep)
+    _append(log, b"new 1\nnew 2\n")
+
+    assert index.entries_for_id("old") == []
+    assert [e["value"] for e in index.entries_for_id("new")] == ["1", "2"]
@@ -12,7 +12,6 @@ import os
 import uuid
 from pathlib import Path
 from typing import Dict, List
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import pytest
 
@@ -21,19 +20,7 @@ from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
-def _strip_query_id(path_or_url: str) -> str:
-    parts = urlsplit(path_or_url)
-    q = parse_qs(parts.query, keep_blank_values=True)
-    q.pop("id", None)
-    query = urlencode(q, doseq=True)
-    return urlunsplit(("", "", parts.path, query, ""))
+from tests.libcurl_consistency.pytest_support.urls import append_req_id, strip_query_id
 
 
 def _load_jsonl(path: Path) -> List[Dict]:
@@ -128,7 +115,7 @@ def test_p0_connection_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, t
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p0_conn"
     proto = "http/1.1"
@@ -140,8 +127,8 @@ def test_p0_connection_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, t
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/empty_200"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -170,7 +157,7 @@ def test_p0_connection_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, t
         b0 = b_entries[0]
         baseline["payload"]["request"] = build_request_semantic(
             str(b0.get("method") or "GET"),
-            _strip_query_id(str(b0.get("path") or "")),
+            strip_query_id(str(b0.get("path") or "")),
             b0.get("headers") or {},
             b"",
         )
@@ -210,7 +197,7 @@ def test_p0_connection_reuse_keepalive_http_1_1(env, lc_logs, lc_observe_http, t
         q0 = q_entries[0]
         qcurl["payload"]["request"] = build_request_semantic(
             str(q0.get("method") or "GET"),
-            _strip_query_id(str(q0.get("path") or "")),
+            strip_query_id(str(q0.get("path") or "")),
             q0.get("headers") or {},
             b"",
         )
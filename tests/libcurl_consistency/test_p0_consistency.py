@@ -26,15 +26,12 @@ from tests.libcurl_consistency.pytest_support.observed import (
 )
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _fmt_args(template: List[str], ctx: Dict) -> List[str]:
     return [str(x).format(**ctx) for x in template]
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
 def _ws_expected_pingpong() -> bytes:
     return b"x" * 125
 
@@ -159,7 +156,7 @@ def test_p0_consistency(case_id, env, lc_logs, request, tmp_path):
             resolved_defaults["url"] = str(resolved_defaults["url"]).format(ws_port=env.ws_port)
         else:
             resolved_defaults["url"] = str(resolved_defaults["url"]).format(https_port=env.https_port)
-        resolved_defaults["url"] = _append_req_id(resolved_defaults["url"], baseline_req_id)
+        resolved_defaults["url"] = append_req_id(resolved_defaults["url"], baseline_req_id)
 
         args = _fmt_args(case["args_template"], resolved_defaults)
         req_meta = _build_request_proto(case_id, resolved_defaults)
@@ -20,15 +20,11 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 guard_planned_test(Path(__file__).name)
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def _hes_accept_encoding_payload(headers: dict, response_headers: dict, body_len: int, body_sha: str) -> dict:
     return {
         "kind": "accept_encoding",
@@ -44,7 +40,7 @@ def test_p1_accept_encoding_gzip_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_accept_encoding"
     proto = "http/1.1"
@@ -60,8 +56,8 @@ def test_p1_accept_encoding_gzip_http_1_1(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/enc"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     try:
         observe_log.write_text("", encoding="utf-8")
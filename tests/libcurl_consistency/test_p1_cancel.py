@@ -7,15 +7,14 @@ P1：取消语义一致性。
 from __future__ import annotations
 
 import os
-import re
 import uuid
-from pathlib import Path
 
 import pytest
 
 from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
+    parse_curlcode_http_code,
     write_json,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
@@ -23,22 +22,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def test_p1_cancel_after_first_chunk(env, lc_logs, lc_observe_http, tmp_path):
@@ -46,7 +30,7 @@ def test_p1_cancel_after_first_chunk(env, lc_logs, lc_observe_http, tmp_path):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_cancel"
     proto = "http/1.1"
@@ -57,8 +41,8 @@ def test_p1_cancel_after_first_chunk(env, lc_logs, lc_observe_http, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/slow_body/8192/4096/5000"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -82,7 +66,7 @@ def test_p1_cancel_after_first_chunk(env, lc_logs, lc_observe_http, tmp_path):
             allowed_exit_codes={0, 7},
         )
 
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
 
@@ -20,11 +20,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id, observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _seed_cookiefile(path: Path, host: str) -> None:
@@ -93,7 +89,7 @@ def test_p1_cookiejar_1903(env, lc_logs, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{env.http_port}/we/want/1903"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
 
     baseline_cookie = tmp_path / "baseline.cookies"
     qcurl_cookie = tmp_path / "qcurl.cookies"
@@ -211,7 +207,7 @@ def test_p1_cookiejar_1920(env, lc_logs, lc_observe_http, tmp_path):
     qt_path = require_qcurl_qttest()
 
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     proto = "http/1.1"
     trace_base = f"lc_{uuid.uuid4().hex[:8]}_cookiejar_1920"
@@ -219,8 +215,8 @@ def test_p1_cookiejar_1920(env, lc_logs, lc_observe_http, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/cookie?scenario=1920"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     baseline_cookie = tmp_path / "baseline.cookies"
     qcurl_cookie = tmp_path / "qcurl.cookies"
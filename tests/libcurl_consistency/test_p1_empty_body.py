@@ -8,7 +8,6 @@ from __future__ import annotations
 
 import os
 import uuid
-from pathlib import Path
 
 import pytest
 
@@ -18,11 +17,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 @pytest.mark.parametrize(
@@ -37,7 +32,7 @@ def test_p1_empty_body(case_id: str, path: str, expected_status: int, env, lc_lo
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_empty_body"
     proto = "http/1.1"
@@ -48,8 +43,8 @@ def test_p1_empty_body(case_id: str, path: str, expected_status: int, env, lc_lo
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}{path}"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": expected_status, "http_version": proto, "headers": {}, "body": None}
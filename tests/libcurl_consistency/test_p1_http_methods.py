@@ -7,306 +7,158 @@ P1：HEAD / PATCH / DELETE 的可观测语义一致性。
 from __future__ import annotations
 
 import os
-import uuid
-from pathlib import Path
+from dataclasses import dataclass
+from functools import partial
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, sha256_bytes, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id, observe_log_offset
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+@dataclass(frozen=True)
+class _MethodCase:
+    case_id: str
+    method: str
+    path: str
+    upload_size: int = 0  # >0 时携带请求体（--data-size / QCURL_LC_UPLOAD_SIZE）
 
 
-def test_p1_method_head_http_1_1(env, lc_observe_http):
-    qt_path = require_qcurl_qttest()
+_METHOD_CASES = [
+    _MethodCase(case_id="p1_method_head", method="HEAD", path="/head_with_body"),
+    _MethodCase(case_id="p1_method_patch", method="PATCH", path="/method", upload_size=128 * 1024),
+    _MethodCase(case_id="p1_method_delete", method="DELETE", path="/method"),
+]
 
-    collect_logs = should_collect_service_logs()
-    port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
-
-    suite = "p1_methods"
-    proto = "http/1.1"
-    case_id = "p1_method_head"
-    case_variant = f"{case_id}_http_1.1"
-
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
-    baseline_req_id = f"{trace_base}__baseline"
-    qcurl_req_id = f"{trace_base}__qcurl"
-
-    base_url = f"http://localhost:{port}/head_with_body"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
-    resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
-
-    try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--method",
-                "HEAD",
-                baseline_url,
-            ],
-            request_meta={"method": "HEAD", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-        )
-
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
-        baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
-        baseline["payload"]["response"]["status"] = obs.status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs.response_headers
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "HEAD", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
-        qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
-        qcurl["payload"]["response"]["status"] = obs.status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs.response_headers
-        write_json(qcurl["path"], qcurl["payload"])
-
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
-        if collect_logs:
-            collect_service_logs_for_case(
-                env,
-                suite=suite,
-                case=case_variant,
-                logs={"observe_http_log": observe_log},
-                meta={
-                    "case_id": case_id,
-                    "case_variant": case_variant,
-                    "proto": proto,
-                    "baseline_req_id": baseline_req_id,
-                    "qcurl_req_id": qcurl_req_id,
-                    "observe_http_port": port,
-                },
-            )
-        raise
-
-
-def test_p1_method_patch_http_1_1(env, lc_observe_http):
-    qt_path = require_qcurl_qttest()
 
+@pytest.mark.parametrize("case", _METHOD_CASES, ids=lambda c: c.method.lower())
+def test_p1_method_http_1_1(case: _MethodCase, env, lc_qt_path, lc_observe_http):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_methods"
     proto = "http/1.1"
-    case_id = "p1_method_patch"
+    case_id = case.case_id
     case_variant = f"{case_id}_http_1.1"
 
-    upload_size = 128 * 1024
+    upload_size = case.upload_size
     body = b"x" * upload_size
+    body_sha256 = sha256_bytes(body) if body else ""
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    base_url = f"http://localhost:{port}/method"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    base_url = f"http://localhost:{port}{case.path}"
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline_args = ["-V", proto, "--method", case.method]
+    case_env = {
+        "QCURL_LC_CASE_ID": case_id,
+        "QCURL_LC_PROTO": proto,
+        "QCURL_LC_REQ_ID": qcurl_req_id,
+        "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+    }
+    if upload_size:
+        baseline_args += ["--data-size", str(upload_size)]
+        case_env["QCURL_LC_UPLOAD_SIZE"] = str(upload_size)
+    baseline_args.append(baseline_url)
+
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--method",
-                "PATCH",
-                "--data-size",
-                str(upload_size),
-                baseline_url,
-            ],
-            request_meta={"method": "PATCH", "url": baseline_url, "headers": {}, "body": body},
-            response_meta=resp_meta,
-            download_count=1,
-        )
-
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
-        baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, body)
-        baseline["payload"]["response"]["status"] = obs.status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs.response_headers
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "PATCH", "url": qcurl_url, "headers": {}, "body": body},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-                "QCURL_LC_UPLOAD_SIZE": str(upload_size),
-            },
-        )
-
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
-        qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, body)
-        qcurl["payload"]["response"]["status"] = obs.status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs.response_headers
-        write_json(qcurl["path"], qcurl["payload"])
-
-        # PATCH 请求体应可由服务端观测到 Content-Length（不要求比较 body 原始字节）
-        assert int(baseline["payload"]["request"]["headers"].get("content-length") or "0") == upload_size
-        assert int(qcurl["payload"]["request"]["headers"].get("content-length") or "0") == upload_size
-
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
-        if collect_logs:
-            collect_service_logs_for_case(
-                env,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
                 suite=suite,
                 case=case_variant,
-                logs={"observe_http_log": observe_log},
-                meta={
-                    "case_id": case_id,
-                    "case_variant": case_variant,
-                    "proto": proto,
-                    "baseline_req_id": baseline_req_id,
-                    "qcurl_req_id": qcurl_req_id,
-                    "observe_http_port": port,
-                    "upload_size": upload_size,
+                client_name="cli_lc_http",
+                args=baseline_args,
+                request_meta={
+                    "method": case.method,
+                    "url": baseline_url,
+                    "headers": {},
+                    "body": body,
+                    "body_sha256": body_sha256,
                 },
-            )
-        raise
-
-
-def test_p1_method_delete_http_1_1(env, lc_observe_http):
-    qt_path = require_qcurl_qttest()
-
-    collect_logs = should_collect_service_logs()
-    port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
-
-    suite = "p1_methods"
-    proto = "http/1.1"
-    case_id = "p1_method_delete"
-    case_variant = f"{case_id}_http_1.1"
-
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
-    baseline_req_id = f"{trace_base}__baseline"
-    qcurl_req_id = f"{trace_base}__qcurl"
-
-    base_url = f"http://localhost:{port}/method"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
-    resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
-
-    try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--method",
-                "DELETE",
-                baseline_url,
-            ],
-            request_meta={"method": "DELETE", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={
+                    "method": case.method,
+                    "url": qcurl_url,
+                    "headers": {},
+                    "body": body,
+                    "body_sha256": body_sha256,
+                },
+                response_meta=resp_meta,
+                download_count=1,
+                case_env=case_env,
+                persist=False,
+            ),
         )
 
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
-        baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
+        baseline["payload"]["request"] = build_request_semantic(
+            obs.method, obs.url, obs.headers, body, body_sha256=body_sha256
+        )
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
         baseline["payload"]["response"]["headers"] = obs.response_headers
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "DELETE", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
+        qcurl["payload"]["request"] = build_request_semantic(
+            obs.method, obs.url, obs.headers, body, body_sha256=body_sha256
         )
-
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
-        qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
         qcurl["payload"]["response"]["headers"] = obs.response_headers
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
+        if upload_size:
+            # 请求体应可由服务端观测到 Content-Length（不要求比较 body 原始字节）
+            assert int(baseline["payload"]["request"]["headers"].get("content-length") or "0") == upload_size
+            assert int(qcurl["payload"]["request"]["headers"].get("content-length") or "0") == upload_size
+
         assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
+            meta = {
+                "case_id": case_id,
+                "case_variant": case_variant,
+                "proto": proto,
+                "baseline_req_id": baseline_req_id,
+                "qcurl_req_id": qcurl_req_id,
+                "observe_http_port": port,
+            }
+            if upload_size:
+                meta["upload_size"] = upload_size
             collect_service_logs_for_case(
                 env,
                 suite=suite,
                 case=case_variant,
                 logs={"observe_http_log": observe_log},
-                meta={
-                    "case_id": case_id,
-                    "case_variant": case_variant,
-                    "proto": proto,
-                    "baseline_req_id": baseline_req_id,
-                    "qcurl_req_id": qcurl_req_id,
-                    "observe_http_port": port,
-                },
+                meta=meta,
             )
         raise
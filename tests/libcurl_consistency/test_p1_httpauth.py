@@ -7,7 +7,6 @@ P1：HTTPAUTH 挑战/协商与跨 host/port 重定向凭据策略一致性。
 from __future__ import annotations
 
 import os
-import re
 import uuid
 from pathlib import Path
 
@@ -18,23 +17,13 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, sha256_bytes, write_json
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines or []:
-        m = _CURLINFO_RE.search(str(line))
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
+from tests.libcurl_consistency.pytest_support.artifacts import (
+    apply_error_namespaces,
+    parse_curlcode_http_code,
+    sha256_bytes,
+    write_json,
+)
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _normalize_req_headers(headers: dict) -> dict:
@@ -104,7 +93,7 @@ def test_p1_httpauth_any_basic(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_httpauth"
     proto = "http/1.1"
@@ -115,8 +104,8 @@ def test_p1_httpauth_any_basic(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/auth/basic"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     expected_requests = 2
     expected_body = b"basic-ok\n"
@@ -246,7 +235,7 @@ def test_p1_httpauth_any_basic_wrong_pass(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_httpauth"
     proto = "http/1.1"
@@ -257,8 +246,8 @@ def test_p1_httpauth_any_basic_wrong_pass(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/auth/basic"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     expected_requests = 2
     expected_body = b""
@@ -286,7 +275,7 @@ def test_p1_httpauth_any_basic_wrong_pass(env, lc_observe_http):
             download_count=1,
         )
 
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
         if http_code != 401:
@@ -408,7 +397,7 @@ def test_p1_httpauth_anysafe_digest(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_httpauth"
     proto = "http/1.1"
@@ -419,8 +408,8 @@ def test_p1_httpauth_anysafe_digest(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/auth/digest"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     expected_requests = 2
     expected_body = b"digest-ok\n"
@@ -550,7 +539,7 @@ def test_p1_httpauth_anysafe_digest_wrong_pass(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_httpauth"
     proto = "http/1.1"
@@ -561,8 +550,8 @@ def test_p1_httpauth_anysafe_digest_wrong_pass(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/auth/digest"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     expected_requests = 2
     expected_body = b""
@@ -590,7 +579,7 @@ def test_p1_httpauth_anysafe_digest_wrong_pass(env, lc_observe_http):
             download_count=1,
         )
 
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
         if http_code != 401:
@@ -729,8 +718,8 @@ def test_p1_unrestricted_auth_redirect(unrestricted: bool, env, lc_observe_http_
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port_a}/redir_abs?to_port={port_b}"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
     expected_body = b"abs-target-ok\n"
 
     try:
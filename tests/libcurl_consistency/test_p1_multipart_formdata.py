@@ -7,22 +7,19 @@ P1：multipart/form-data 语义一致性。
 from __future__ import annotations
 
 import os
-import uuid
-from pathlib import Path
+from functools import partial
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id, observe_log_offset
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _drop_non_comparable_headers(headers: dict) -> dict:
@@ -32,46 +29,67 @@ def _drop_non_comparable_headers(headers: dict) -> dict:
     return out
 
 
-def test_p1_multipart_formdata_http_1_1(env, lc_logs, lc_observe_http):
-    qt_path = require_qcurl_qttest()
-
+def test_p1_multipart_formdata_http_1_1(env, lc_qt_path, lc_logs, lc_observe_http):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_multipart"
     proto = "http/1.1"
     case_id = "p1_multipart_formdata"
     case_variant = f"{case_id}_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}/multipart"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--multipart-demo",
-                baseline_url,
-            ],
-            request_meta={"method": "POST", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--multipart-demo",
+                    baseline_url,
+                ],
+                request_meta={"method": "POST", "url": baseline_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "POST", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": case_id,
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
         assert obs.status == 200
         baseline["payload"]["request"] = build_request_semantic(
             obs.method,
@@ -82,27 +100,8 @@ def test_p1_multipart_formdata_http_1_1(env, lc_logs, lc_observe_http):
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
         baseline["payload"]["response"]["headers"] = obs.response_headers
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "POST", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
         assert obs.status == 200
         qcurl["payload"]["request"] = build_request_semantic(
             obs.method,
@@ -113,10 +112,12 @@ def test_p1_multipart_formdata_http_1_1(env, lc_logs, lc_observe_http):
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
         qcurl["payload"]["response"]["headers"] = obs.response_headers
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
         assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
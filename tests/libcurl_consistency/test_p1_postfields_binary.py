@@ -7,58 +7,66 @@ P1：`CURLOPT_POSTFIELDS` 二进制 payload 一致性。
 from __future__ import annotations
 
 import os
-import uuid
+from collections import ChainMap
+from functools import partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import write_json
+from tests.libcurl_consistency.pytest_support.artifacts import write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.case_defs import P1_CASES
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
 from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id, nghttpx_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _fmt_args(template: List[str], defaults: Dict) -> List[str]:
     return [str(x).format(**defaults) for x in template]
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def _postfields_binary_payload() -> bytes:
     return b".abc\x00xyz"
 
 
 @pytest.mark.parametrize("case_id", sorted(P1_CASES.keys()))
-def test_p1_postfields_binary(case_id, env, lc_logs, tmp_path):
+def test_p1_postfields_binary(case_id, env, lc_qt_path, lc_ports_ctx, lc_logs, lc_access_log_index, tmp_path):
     case = P1_CASES[case_id]
     collect_logs = should_collect_service_logs()
-    qt_path = require_qcurl_qttest()
 
     http_protos = ["http/1.1", "h2"]
     if env.have_h3():
         http_protos.append("h3")
 
+    body = _postfields_binary_payload()
+    # 与协议无关的静态部分只构造一次；每个协议只叠加 PROTO/REQ_ID
+    base_case_env = MappingProxyType({
+        "QCURL_LC_CASE_ID": case_id,
+        "QCURL_LC_HTTPS_PORT": str(env.https_port),
+        "QCURL_LC_COUNT": "1",
+        "QCURL_LC_DOCNAME": "",
+        "QCURL_LC_UPLOAD_SIZE": str(len(body)),
+        "QCURL_LC_ABORT_OFFSET": "0",
+        "QCURL_LC_FILE_SIZE": "0",
+    })
+
     for proto in http_protos:
-        trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}_{proto.replace('/', '_')}"
+        trace_base = f"lc_{trace_id()}_{case_id}_{proto.replace('/', '_')}"
         baseline_req_id = f"{trace_base}__baseline"
         qcurl_req_id = f"{trace_base}__qcurl"
 
         resolved_defaults = dict(case["defaults"])
         resolved_defaults["proto"] = proto
-        resolved_defaults["url"] = str(resolved_defaults["url"]).format(
-            https_port=env.https_port,
-        )
-        resolved_defaults["url"] = _append_req_id(resolved_defaults["url"], baseline_req_id)
+        resolved_defaults["url"] = str(resolved_defaults["url"]).format_map(lc_ports_ctx)
+        resolved_defaults["url"] = append_req_id(resolved_defaults["url"], baseline_req_id)
 
         args = _fmt_args(case["args_template"], resolved_defaults)
-        body = _postfields_binary_payload()
         req_meta = {
             "method": "POST",
             "url": resolved_defaults["url"],
@@ -73,76 +81,87 @@ def test_p1_postfields_binary(case_id, env, lc_logs, tmp_path):
         }
 
         case_variant = f"{case['case']}_{proto.replace('/', '_')}"
-        case_env = {
-            "QCURL_LC_CASE_ID": case_id,
-            "QCURL_LC_PROTO": str(resolved_defaults.get("proto", "h2")),
-            "QCURL_LC_HTTPS_PORT": str(env.https_port),
-            "QCURL_LC_COUNT": "1",
-            "QCURL_LC_DOCNAME": "",
-            "QCURL_LC_UPLOAD_SIZE": str(len(body)),
-            "QCURL_LC_ABORT_OFFSET": "0",
-            "QCURL_LC_FILE_SIZE": "0",
-            "QCURL_LC_REQ_ID": qcurl_req_id,
-        }
+        case_env = ChainMap(
+            {
+                "QCURL_LC_PROTO": str(resolved_defaults.get("proto", "h2")),
+                "QCURL_LC_REQ_ID": qcurl_req_id,
+            },
+            base_case_env,
+        )
 
+        baseline = qcurl = None
         try:
             try:
-                baseline = run_libtest_case(
-                    env=env,
-                    suite=case["suite"],
-                    case=case_variant,
-                    client_name=case["client"],
-                    args=args,
-                    request_meta=req_meta,
-                    response_meta=resp_meta,
-                    download_count=case.get("baseline_download_count"),
+                baseline, qcurl = run_pair(
+                    partial(
+                        run_libtest_case,
+                        env=env,
+                        suite=case["suite"],
+                        case=case_variant,
+                        client_name=case["client"],
+                        args=args,
+                        request_meta=req_meta,
+                        response_meta=resp_meta,
+                        download_count=case.get("baseline_download_count"),
+                        persist=False,
+                    ),
+                    partial(
+                        run_qt_test,
+                        env=env,
+                        suite=case["suite"],
+                        case=case_variant,
+                        qt_executable=lc_qt_path,
+                        args=[],
+                        request_meta=req_meta,
+                        response_meta=resp_meta,
+                        download_files=None,
+                        download_count=case.get("qcurl_download_count"),
+                        case_env=case_env,
+                        persist=False,
+                    ),
                 )
             except FileNotFoundError as exc:
                 raise AssertionError(f"gate preflight should have failed before pytest started: {exc}") from exc
 
             if proto == "h3":
                 access_log = Path(lc_logs["nghttpx_access_log"])
-                obs = nghttpx_observed_for_id(access_log, baseline_req_id, require_range=False)
+                obs = nghttpx_observed_for_id(
+                    access_log, baseline_req_id, require_range=False, index=lc_access_log_index.get("nghttpx")
+                )
             else:
                 access_log = Path(lc_logs["httpd_access_log"])
-                obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False)
+                obs = httpd_observed_for_id(
+                    access_log, baseline_req_id, require_range=False, index=lc_access_log_index.get("httpd")
+                )
             assert obs.http_version == proto
             baseline["payload"]["request"]["method"] = obs.method
             baseline["payload"]["request"]["url"] = obs.url
             baseline["payload"]["request"]["headers"] = obs.headers
             baseline["payload"]["response"]["status"] = obs.status
             baseline["payload"]["response"]["http_version"] = obs.http_version
-            write_json(baseline["path"], baseline["payload"])
-
-            qcurl = run_qt_test(
-                env=env,
-                suite=case["suite"],
-                case=case_variant,
-                qt_executable=qt_path,
-                args=[],
-                request_meta=req_meta,
-                response_meta=resp_meta,
-                download_files=None,
-                download_count=case.get("qcurl_download_count"),
-                case_env=case_env,
-            )
 
             if proto == "h3":
                 access_log = Path(lc_logs["nghttpx_access_log"])
-                obs = nghttpx_observed_for_id(access_log, qcurl_req_id, require_range=False)
+                obs = nghttpx_observed_for_id(
+                    access_log, qcurl_req_id, require_range=False, index=lc_access_log_index.get("nghttpx")
+                )
             else:
                 access_log = Path(lc_logs["httpd_access_log"])
-                obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False)
+                obs = httpd_observed_for_id(
+                    access_log, qcurl_req_id, require_range=False, index=lc_access_log_index.get("httpd")
+                )
             assert obs.http_version == proto
             qcurl["payload"]["request"]["method"] = obs.method
             qcurl["payload"]["request"]["url"] = obs.url
             qcurl["payload"]["request"]["headers"] = obs.headers
             qcurl["payload"]["response"]["status"] = obs.status
             qcurl["payload"]["response"]["http_version"] = obs.http_version
+            write_json(baseline["path"], baseline["payload"])
             write_json(qcurl["path"], qcurl["payload"])
 
             assert_artifacts_match(baseline["path"], qcurl["path"])
-        except Exception:
+        except Exception as exc:
+            write_results(*pair_results(exc, baseline, qcurl))
             if collect_logs:
                 collect_service_logs_for_case(
                     env,
@@ -6,181 +6,145 @@ P1：进度摘要一致性。
 
 from __future__ import annotations
 
-import json
 import os
-from pathlib import Path
+from dataclasses import dataclass
+from functools import partial
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, read_json, sha256_bytes, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+@dataclass(frozen=True)
+class _ProgressCase:
+    case_id: str
+    lane: str  # progress_summary 中需校验终值的方向："download" | "upload"
+    method: str
+    path: str
+    upload_size: int = 0
+    docname: str = ""
 
 
-def test_p1_progress_download_h2(env, lc_logs, tmp_path):
-    qt_path = require_qcurl_qttest()
+_PROGRESS_CASES = [
+    _ProgressCase(case_id="p1_progress_download", lane="download", method="GET", path="/data-1m", docname="data-1m"),
+    _ProgressCase(
+        case_id="p1_progress_upload",
+        lane="upload",
+        method="POST",
+        path="/curltest/echo",
+        upload_size=128 * 1024,
+    ),
+]
 
+
+@pytest.mark.parametrize("case", _PROGRESS_CASES, ids=lambda c: c.lane)
+def test_p1_progress_h2(case: _ProgressCase, env, lc_qt_path, lc_logs, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p1_progress"
     proto = "h2"
-    case_variant = "p1_progress_download_h2"
+    case_id = case.case_id
+    case_variant = f"{case_id}_h2"
 
-    url = f"https://localhost:{int(env.https_port)}/data-1m"
+    upload_size = case.upload_size
+    body = b"x" * upload_size
+    body_sha256 = sha256_bytes(body) if body else ""
+    url = f"https://localhost:{int(env.https_port)}{case.path}"
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
     case_dir = ensure_case_dir(artifacts_root(env), suite=suite, case=case_variant)
     baseline_progress = case_dir / "baseline_progress_summary.json"
 
+    baseline_args = ["-V", proto]
+    case_env = {
+        "QCURL_LC_CASE_ID": case_id,
+        "QCURL_LC_PROTO": proto,
+        "QCURL_LC_HTTPS_PORT": str(int(env.https_port)),
+    }
+    if upload_size:
+        baseline_args += ["--method", case.method, "--data-size", str(upload_size)]
+        case_env["QCURL_LC_UPLOAD_SIZE"] = str(upload_size)
+    if case.docname:
+        case_env["QCURL_LC_DOCNAME"] = case.docname
+    baseline_args += ["--progress-out", str(baseline_progress), url]
+
+    baseline = qcurl = None
     try:
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--progress-out",
-                str(baseline_progress),
-                url,
-            ],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-        )
-        baseline["payload"]["progress_summary"] = _load_json(baseline_progress)
-        write_json(baseline["path"], baseline["payload"])
-
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p1_progress_download",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_HTTPS_PORT": str(int(env.https_port)),
-                "QCURL_LC_DOCNAME": "data-1m",
-            },
-        )
-        qcurl_progress = qcurl["path"].parent / "qcurl_run" / "progress_summary.json"
-        qcurl["payload"]["progress_summary"] = _load_json(qcurl_progress)
-        write_json(qcurl["path"], qcurl["payload"])
-
-        # 进度摘要终值应对齐响应 body_len（该场景下可由 Content-Length 稳定确定）。
-        expected_len = int(baseline["payload"]["response"]["body_len"])
-        assert expected_len > 0
-        assert baseline["payload"]["progress_summary"]["download"]["now_max"] == expected_len
-        assert baseline["payload"]["progress_summary"]["download"]["total_max"] == expected_len
-        assert qcurl["payload"]["progress_summary"]["download"]["now_max"] == expected_len
-        assert qcurl["payload"]["progress_summary"]["download"]["total_max"] == expected_len
-
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
-        if collect_logs:
-            collect_service_logs_for_case(
-                env,
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
                 suite=suite,
                 case=case_variant,
-                logs=lc_logs,
-                meta={
-                    "case_id": "p1_progress_download",
-                    "proto": proto,
+                client_name="cli_lc_http",
+                args=baseline_args,
+                request_meta={
+                    "method": case.method,
                     "url": url,
+                    "headers": {},
+                    "body": body,
+                    "body_sha256": body_sha256,
                 },
-            )
-        raise
-
-
-def test_p1_progress_upload_h2(env, lc_logs, tmp_path):
-    qt_path = require_qcurl_qttest()
-
-    collect_logs = should_collect_service_logs()
-    suite = "p1_progress"
-    proto = "h2"
-    case_variant = "p1_progress_upload_h2"
-
-    upload_size = 128 * 1024
-    body = b"x" * upload_size
-    url = f"https://localhost:{int(env.https_port)}/curltest/echo"
-    resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
-
-    case_dir = ensure_case_dir(artifacts_root(env), suite=suite, case=case_variant)
-    baseline_progress = case_dir / "baseline_progress_summary.json"
-
-    try:
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--method",
-                "POST",
-                "--data-size",
-                str(upload_size),
-                "--progress-out",
-                str(baseline_progress),
-                url,
-            ],
-            request_meta={"method": "POST", "url": url, "headers": {}, "body": body},
-            response_meta=resp_meta,
-            download_count=1,
-        )
-        baseline["payload"]["progress_summary"] = _load_json(baseline_progress)
-        write_json(baseline["path"], baseline["payload"])
-
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "POST", "url": url, "headers": {}, "body": body},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p1_progress_upload",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_HTTPS_PORT": str(int(env.https_port)),
-                "QCURL_LC_UPLOAD_SIZE": str(upload_size),
-            },
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={
+                    "method": case.method,
+                    "url": url,
+                    "headers": {},
+                    "body": body,
+                    "body_sha256": body_sha256,
+                },
+                response_meta=resp_meta,
+                download_count=1,
+                case_env=case_env,
+                persist=False,
+            ),
         )
+        baseline["payload"]["progress_summary"] = read_json(baseline_progress)
         qcurl_progress = qcurl["path"].parent / "qcurl_run" / "progress_summary.json"
-        qcurl["payload"]["progress_summary"] = _load_json(qcurl_progress)
+        qcurl["payload"]["progress_summary"] = read_json(qcurl_progress)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        # 上传进度摘要的 now_max/total_max 应对齐请求体大小。
-        assert baseline["payload"]["progress_summary"]["upload"]["now_max"] == upload_size
-        assert baseline["payload"]["progress_summary"]["upload"]["total_max"] == upload_size
-        assert qcurl["payload"]["progress_summary"]["upload"]["now_max"] == upload_size
-        assert qcurl["payload"]["progress_summary"]["upload"]["total_max"] == upload_size
+        # 下载：终值对齐响应 body_len（该场景下可由 Content-Length 稳定确定）；上传：终值对齐请求体大小。
+        if case.lane == "upload":
+            expected_len = upload_size
+        else:
+            expected_len = int(baseline["payload"]["response"]["body_len"])
+        assert expected_len > 0
+        for payload in (baseline["payload"], qcurl["payload"]):
+            assert payload["progress_summary"][case.lane]["now_max"] == expected_len
+            assert payload["progress_summary"][case.lane]["total_max"] == expected_len
 
         assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
+            meta = {
+                "case_id": case_id,
+                "proto": proto,
+                "url": url,
+            }
+            if upload_size:
+                meta["upload_size"] = upload_size
             collect_service_logs_for_case(
                 env,
                 suite=suite,
                 case=case_variant,
                 logs=lc_logs,
-                meta={
-                    "case_id": "p1_progress_upload",
-                    "proto": proto,
-                    "url": url,
-                    "upload_size": upload_size,
-                },
+                meta=meta,
             )
         raise
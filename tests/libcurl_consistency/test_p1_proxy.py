@@ -7,28 +7,32 @@ P1：HTTP proxy 可观测一致性。
 from __future__ import annotations
 
 import os
-import uuid
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, build_request_semantic, ensure_case_dir, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, build_request_semantic, ensure_case_dir, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.case_defs import P1_PROXY_CASES
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id, proxy_observed_for_log
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id, observe_log_offset, proxy_observed_for_log
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+def _compile_args(template: List[str]) -> Tuple[Tuple[str, bool], ...]:
+    # 预先标记需要格式化的参数，纯字面量参数在每次用例中直接复用
+    return tuple((str(x), "{" in str(x)) for x in template)
 
 
-def _fmt_args(template: List[str], defaults: Dict) -> List[str]:
-    return [str(x).format(**defaults) for x in template]
+_COMPILED_ARGS = {case_id: _compile_args(case["args_template"]) for case_id, case in P1_PROXY_CASES.items()}
+
+
+def _fmt_args(compiled: Tuple[Tuple[str, bool], ...], defaults: Dict) -> List[str]:
+    return [s.format_map(defaults) if needs_fmt else s for s, needs_fmt in compiled]
 
 
 def _extract_connect_blocks(raw: bytes) -> list[list[str]]:
@@ -65,19 +69,17 @@ def _extract_connect_blocks(raw: bytes) -> list[list[str]]:
 
 
 @pytest.mark.parametrize("case_id", sorted(P1_PROXY_CASES.keys()))
-def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p1_proxy_basic_auth(case_id, env, lc_qt_path, lc_ports_ctx, lc_logs, lc_http_proxy, tmp_path):
     collect_logs = should_collect_service_logs()
     case = P1_PROXY_CASES[case_id]
 
-    proxy_port = int(lc_http_proxy["port"])
-    proxy_log = Path(str(lc_http_proxy["log_file"]))
-    proxy_user = str(lc_http_proxy["username"])
-    proxy_pass = str(lc_http_proxy["password"])
-    proxy_url = f"http://localhost:{proxy_port}"
+    proxy_port = lc_http_proxy["port"]
+    proxy_log = lc_http_proxy["log_file"]
+    proxy_user = lc_http_proxy["username"]
+    proxy_pass = lc_http_proxy["password"]
+    proxy_url = lc_http_proxy["url"]
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
@@ -85,20 +87,17 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
     proto = "http/1.1" if case_id == "proxy_http_basic_auth" else "h2"
     case_variant = f"{case['case']}_{proto.replace('/', '_')}"
 
-    base_defaults = dict(case["defaults"])
-    base_defaults.update({
+    base_defaults = {
+        **case["defaults"],
         "proxy_url": proxy_url,
         "proxy_user": proxy_user,
         "proxy_pass": proxy_pass,
-    })
-    base_target_url = str(base_defaults["url"]).format(
-        http_port=env.http_port,
-        https_port=env.https_port,
-    )
-    baseline_url = _append_req_id(base_target_url, baseline_req_id)
+    }
+    base_target_url = str(base_defaults["url"]).format_map(lc_ports_ctx)
+    baseline_url = append_req_id(base_target_url, baseline_req_id)
     base_defaults["url"] = baseline_url
 
-    args = _fmt_args(case["args_template"], base_defaults)
+    args = _fmt_args(_COMPILED_ARGS[case_id], base_defaults)
     case_dir = ensure_case_dir(artifacts_root(env), suite=suite, case=case_variant)
     baseline_header_file = case_dir / "baseline_response_headers.data"
     if args:
@@ -109,8 +108,9 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
 
     access_log = Path(lc_logs["httpd_access_log"])
 
+    baseline = qcurl = None
     try:
-        proxy_log.write_text("", encoding="utf-8")
+        log_start = observe_log_offset(proxy_log)
         baseline = run_libtest_case(
             env=env,
             suite=suite,
@@ -120,9 +120,10 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
             request_meta=req_meta,
             response_meta=resp_meta,
             download_count=case.get("baseline_download_count"),
+            persist=False,
         )
         proxy_method = "GET" if case_id == "proxy_http_basic_auth" else "CONNECT"
-        proxy_obs = proxy_observed_for_log(proxy_log, method=proxy_method)
+        proxy_obs = proxy_observed_for_log(proxy_log, method=proxy_method, start_offset=log_start)
         origin_obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False)
 
         if case_id == "proxy_http_basic_auth":
@@ -136,15 +137,9 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
             ]
         baseline["payload"]["response"]["status"] = origin_obs.status
         baseline["payload"]["response"]["http_version"] = origin_obs.http_version
-        write_json(baseline["path"], baseline["payload"])
 
-        proxy_log.write_text("", encoding="utf-8")
-        qcurl_defaults = dict(case["defaults"])
-        qcurl_target_url = str(qcurl_defaults["url"]).format(
-            http_port=env.http_port,
-            https_port=env.https_port,
-        )
-        qcurl_url = _append_req_id(qcurl_target_url, qcurl_req_id)
+        log_start = observe_log_offset(proxy_log)
+        qcurl_url = append_req_id(base_target_url, qcurl_req_id)
 
         case_env = {
             "QCURL_LC_CASE_ID": case_id,
@@ -164,15 +159,16 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
             env=env,
             suite=suite,
             case=case_variant,
-            qt_executable=qt_path,
+            qt_executable=lc_qt_path,
             args=[],
             request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
             response_meta=resp_meta,
             download_count=case.get("qcurl_download_count"),
             case_env=case_env,
+            persist=False,
         )
 
-        proxy_obs = proxy_observed_for_log(proxy_log, method=proxy_method)
+        proxy_obs = proxy_observed_for_log(proxy_log, method=proxy_method, start_offset=log_start)
         origin_obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False)
 
         if case_id == "proxy_http_basic_auth":
@@ -186,7 +182,6 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
             ]
         qcurl["payload"]["response"]["status"] = origin_obs.status
         qcurl["payload"]["response"]["http_version"] = origin_obs.http_version
-        write_json(qcurl["path"], qcurl["payload"])
 
         # 诊断型采集：CONNECT 阶段响应头 blocks 仅用于辅助定位；
         # 缺失不触发失败，也不参与一致性断言。
@@ -211,11 +206,13 @@ def test_p1_proxy_basic_auth(case_id, env, lc_logs, lc_http_proxy, tmp_path):
 
             baseline["payload"]["connect_headers_diag"] = diag
             qcurl["payload"]["connect_headers_diag"] = diag
-            write_json(baseline["path"], baseline["payload"])
-            write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
+        write_json(baseline["path"], baseline["payload"])
+        write_json(qcurl["path"], qcurl["payload"])
+
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
     except Exception:
+        write_results(baseline, qcurl)
         if collect_logs:
             collect_service_logs_for_case(
                 env,
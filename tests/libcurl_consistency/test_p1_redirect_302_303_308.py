@@ -5,34 +5,22 @@ P1: 302/303/308 redirect method and body observable consistency.
 from __future__ import annotations
 
 import os
-import re
 import uuid
-from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import (
+    apply_error_namespaces,
+    build_request_semantic,
+    parse_curlcode_http_code,
+    write_json,
+)
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _requests_from_observed(observed_list) -> list[dict]:
@@ -75,7 +63,7 @@ def test_p1_redirect_302_303_308_method_body(case_id, status, method, post_redir
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect_302_303_308"
     proto = "http/1.1"
@@ -88,8 +76,8 @@ def test_p1_redirect_302_303_308_method_body(case_id, status, method, post_redir
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/redir_{status}"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
     args = ["-V", proto, "--follow", "--max-redirs", "10", "--method", method]
@@ -125,7 +113,7 @@ def test_p1_redirect_302_303_308_method_body(case_id, status, method, post_redir
         baseline["payload"]["response"]["http_version"] = proto
         baseline["payload"]["response"]["headers"] = dict(obs_list[-1].response_headers)
         if body_kind == "nonseekable":
-            curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+            curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
             apply_error_namespaces(
                 baseline["payload"],
                 kind="redirect_replay",
@@ -7,73 +7,103 @@ P1：重定向链路与模拟登录态 cookie 语义一致性。
 from __future__ import annotations
 
 import os
-import uuid
-from pathlib import Path
+from functools import partial
+from typing import Optional
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import build_request_semantic, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id, observe_log_offset
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _responses_from_observed(*, observed_list, final_response, proto: str) -> list[dict]:
-    items: list[dict] = []
-    for idx, obs in enumerate(observed_list):
-        is_last = (idx == len(observed_list) - 1)
-        if is_last:
-            items.append({
-                "status": int(obs.status),
-                "http_version": proto,
-                "headers": dict(obs.response_headers),
-                "body_len": int(final_response.get("body_len") or 0),
-                "body_sha256": str(final_response.get("body_sha256") or ""),
-            })
-        else:
-            items.append({
-                "status": int(obs.status),
-                "http_version": proto,
-                "headers": dict(obs.response_headers),
-                "body_len": 0,
-                "body_sha256": "",
-            })
+    # ObserveHttpObserved.status 已是 int、response_headers 已是 dict：直接引用，不再逐条转换/拷贝。
+    # payload 后续只被序列化/对比读取，不会修改这些 headers。
+    final_len = int(final_response.get("body_len") or 0)
+    final_sha = final_response.get("body_sha256") or ""
+    items = [{
+        "status": obs.status,
+        "http_version": proto,
+        "headers": obs.response_headers,
+        "body_len": 0,
+        "body_sha256": "",
+    } for obs in observed_list]
+    if items:
+        items[-1]["body_len"] = final_len
+        items[-1]["body_sha256"] = final_sha
     return items
 
 
+def _finalize_chain_payload(payload: dict, obs_list, proto: str, *, requests: Optional[list[dict]] = None) -> None:
+    """
+    按观测到的跳转链回填 payload：requests/responses、首个请求与最终响应。
+    - requests：调用方自定义的请求摘要（如带 body 的 build_request_semantic）；缺省为无 body 的 GET 链
+    """
+    if requests is None:
+        requests = [{
+            "method": obs.method,
+            "url": obs.url,
+            "headers": obs.headers,
+            "body_len": 0,
+            "body_sha256": "",
+        } for obs in obs_list]
+    payload["requests"] = requests
+    payload["responses"] = _responses_from_observed(
+        observed_list=obs_list,
+        final_response=payload["response"],
+        proto=proto,
+    )
+    first = obs_list[0]
+    last = obs_list[-1]
+    payload["request"].update(method=first.method, url=first.url, headers=first.headers)
+    payload["response"].update(status=last.status, http_version=proto, headers=last.response_headers)
+
+
+_REDIR_MAX_HOP = 3  # 用例起点为 /redir/3
+
+
+def _bucket_order(observed_list, rank, size: int):
+    # 线性分桶：rank 返回 [0, size) 内的槽位，其余（None/越界）按原顺序排在最后；同槽位保持原顺序。
+    buckets: list[list] = [[] for _ in range(size + 1)]
+    for o in observed_list:
+        r = rank(o)
+        buckets[r if r is not None and 0 <= r < size else size].append(o)
+    return [o for bucket in buckets for o in bucket]
+
+
+def _order_by_path(observed_list, order: dict[str, int]):
+    return _bucket_order(observed_list, lambda o: order.get(str(o.url).split("?", 1)[0]), len(order))
+
+
 def _order_redir_chain(observed_list):
-    def key(o) -> int:
+    # 按跳数倒序（/redir/3 → /redir/0），稳定化观测结果。
+    def rank(o):
         s = str(o.url)
         if not s.startswith("/redir/"):
-            return -1
-        try:
-            return int(s.split("/", 2)[2])
-        except Exception:
-            return -1
-    return sorted(observed_list, key=key, reverse=True)
+            return None
+        hop = s[len("/redir/"):]
+        return _REDIR_MAX_HOP - int(hop) if hop.isdigit() else None
+    return _bucket_order(observed_list, rank, _REDIR_MAX_HOP + 1)
 
 
 def _order_login_chain(observed_list):
     # 按登录跳转链的目标路径排序，稳定化观测结果。
-    order = {"/login": 0, "/home": 1}
-    return sorted(observed_list, key=lambda o: order.get(str(o.url).split("?", 1)[0], 99))
+    return _order_by_path(observed_list, {"/login": 0, "/home": 1})
 
 def _order_post_301_chain(observed_list):
     # 按 POST 301 跳转链的目标路径排序，稳定化观测结果。
-    order = {"/redir_post_301": 0, "/final_post_301": 1}
-    return sorted(observed_list, key=lambda o: order.get(str(o.url).split("?", 1)[0], 99))
+    return _order_by_path(observed_list, {"/redir_post_301": 0, "/final_post_301": 1})
 
 def _order_cookie_path_chain(observed_list):
     # 按 Cookie Path 跳转链的目标路径排序，稳定化观测结果。
-    order = {"/login_path": 0, "/a/step": 1, "/b/final": 2}
-    return sorted(observed_list, key=lambda o: order.get(str(o.url).split("?", 1)[0], 99))
+    return _order_by_path(observed_list, {"/login_path": 0, "/a/step": 1, "/b/final": 2})
 
 def _cookie_names_from_summary(summary: str) -> set[str]:
     summary = (summary or "").strip()
@@ -87,114 +117,84 @@ def _cookie_names_from_summary(summary: str) -> set[str]:
 
 
 @pytest.mark.parametrize("follow", [False, True])
-def test_p1_redirect_followlocation(follow: bool, env, lc_observe_http):
-    qt_path = require_qcurl_qttest()
-
+def test_p1_redirect_followlocation(follow: bool, env, lc_qt_path, lc_observe_http):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect"
     proto = "http/1.1"
     case_variant = f"lc_redirect_{'follow' if follow else 'nofollow'}_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_redir_{'1' if follow else '0'}"
+    trace_base = f"lc_{trace_id()}_redir_{'1' if follow else '0'}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    url = f"http://localhost:{port}/redir/3"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    url = f"http://localhost:{port}/redir/3?"
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": 200 if follow else 302, "http_version": proto, "headers": {}, "body": None}
 
     expected_requests = 4 if follow else 1
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
+        log_start = observe_log_offset(observe_log)
         baseline_args = ["-V", proto]
         if follow:
             baseline_args.extend(["--follow", "--max-redirs", "10"])
         baseline_args.append(baseline_url)
 
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=baseline_args,
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=baseline_args,
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p1_redirect_follow" if follow else "p1_redirect_nofollow",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=expected_requests)
+        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=expected_requests, start_offset=log_start)
         if follow:
             obs_list = _order_redir_chain(obs_list)
-        baseline["payload"]["requests"] = [{
-            "method": obs.method,
-            "url": obs.url,
-            "headers": obs.headers,
-            "body_len": 0,
-            "body_sha256": "",
-        } for obs in obs_list]
-        baseline["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=baseline["payload"]["response"],
-            proto=proto,
-        )
-        baseline["payload"]["request"]["method"] = obs_list[0].method
-        baseline["payload"]["request"]["url"] = obs_list[0].url
-        baseline["payload"]["request"]["headers"] = obs_list[0].headers
-        baseline["payload"]["response"]["status"] = obs_list[-1].status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs_list[-1].response_headers
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p1_redirect_follow" if follow else "p1_redirect_nofollow",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
+        _finalize_chain_payload(baseline["payload"], obs_list, proto)
 
-        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=expected_requests)
+        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=expected_requests, start_offset=log_start)
         if follow:
             obs_list = _order_redir_chain(obs_list)
-        qcurl["payload"]["requests"] = [{
-            "method": obs.method,
-            "url": obs.url,
-            "headers": obs.headers,
-            "body_len": 0,
-            "body_sha256": "",
-        } for obs in obs_list]
-        qcurl["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=qcurl["payload"]["response"],
-            proto=proto,
-        )
-        qcurl["payload"]["request"]["method"] = obs_list[0].method
-        qcurl["payload"]["request"]["url"] = obs_list[0].url
-        qcurl["payload"]["request"]["headers"] = obs_list[0].headers
-        qcurl["payload"]["response"]["status"] = obs_list[-1].status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs_list[-1].response_headers
+        _finalize_chain_payload(qcurl["payload"], obs_list, proto)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -214,17 +214,15 @@ def test_p1_redirect_followlocation(follow: bool, env, lc_observe_http):
         raise
 
 
-def test_p1_redirect_post_301_to_get(env, lc_observe_http):
+def test_p1_redirect_post_301_to_get(env, lc_qt_path, lc_observe_http):
     """
     POST 301 重定向的方法重写语义。
     - 断言服务端观测到的请求序列为 POST -> GET（顺序敏感）
     - 最终响应体字节一致
     """
-    qt_path = require_qcurl_qttest()
-
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect"
     proto = "http/1.1"
@@ -234,103 +232,97 @@ def test_p1_redirect_post_301_to_get(env, lc_observe_http):
     upload_size = 16
     body = b"x" * upload_size
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_post301"
+    trace_base = f"lc_{trace_id()}_post301"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    url = f"http://localhost:{port}/redir_post_301"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    url = f"http://localhost:{port}/redir_post_301?"
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     req_meta = {"method": "POST", "url": baseline_url, "headers": {}, "body": body}
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--follow",
-                "--max-redirs",
-                "10",
-                "--method",
-                "POST",
-                "--data-size",
-                str(upload_size),
-                baseline_url,
-            ],
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--follow",
+                    "--max-redirs",
+                    "10",
+                    "--method",
+                    "POST",
+                    "--data-size",
+                    str(upload_size),
+                    baseline_url,
+                ],
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "POST", "url": qcurl_url, "headers": {}, "body": body},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": case_id,
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_UPLOAD_SIZE": str(upload_size),
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2)
+        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2, start_offset=log_start)
         obs_list = _order_post_301_chain(obs_list)
         assert [o.method for o in obs_list] == ["POST", "GET"]
         assert [int(o.status) for o in obs_list] == [301, 200]
 
-        baseline["payload"]["requests"] = [
-            build_request_semantic(obs.method, obs.url, obs.headers, body if obs.method == "POST" else b"")
-            for obs in obs_list
-        ]
-        baseline["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=baseline["payload"]["response"],
-            proto=proto,
-        )
-        baseline["payload"]["request"]["method"] = obs_list[0].method
-        baseline["payload"]["request"]["url"] = obs_list[0].url
-        baseline["payload"]["request"]["headers"] = obs_list[0].headers
-        baseline["payload"]["response"]["status"] = obs_list[-1].status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs_list[-1].response_headers
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "POST", "url": qcurl_url, "headers": {}, "body": body},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_UPLOAD_SIZE": str(upload_size),
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
+        _finalize_chain_payload(
+            baseline["payload"],
+            obs_list,
+            proto,
+            requests=[
+                build_request_semantic(obs.method, obs.url, obs.headers, body if obs.method == "POST" else b"")
+                for obs in obs_list
+            ],
         )
 
-        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2)
+        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2, start_offset=log_start)
         obs_list = _order_post_301_chain(obs_list)
-        qcurl["payload"]["requests"] = [
-            build_request_semantic(obs.method, obs.url, obs.headers, body if obs.method == "POST" else b"")
-            for obs in obs_list
-        ]
-        qcurl["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=qcurl["payload"]["response"],
-            proto=proto,
+        _finalize_chain_payload(
+            qcurl["payload"],
+            obs_list,
+            proto,
+            requests=[
+                build_request_semantic(obs.method, obs.url, obs.headers, body if obs.method == "POST" else b"")
+                for obs in obs_list
+            ],
         )
-        qcurl["payload"]["request"]["method"] = obs_list[0].method
-        qcurl["payload"]["request"]["url"] = obs_list[0].url
-        qcurl["payload"]["request"]["headers"] = obs_list[0].headers
-        qcurl["payload"]["response"]["status"] = obs_list[-1].status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs_list[-1].response_headers
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -350,30 +342,29 @@ def test_p1_redirect_post_301_to_get(env, lc_observe_http):
         raise
 
 
-def test_p1_cookie_path_match_redirect_chain(env, lc_observe_http, tmp_path):
+def test_p1_cookie_path_match_redirect_chain(env, lc_qt_path, lc_observe_http, tmp_path):
     """
     重定向链中的 Cookie Path 匹配发送语义。
     - /login_path：Set-Cookie(Path=/a) 并跳转到 /a/step
     - /a/step：必须发送 Cookie（Path 匹配），再跳转到 /b/final
     - /b/final：必须不发送 Cookie（Path 不匹配），最终 200
     """
-    qt_path = require_qcurl_qttest()
-
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_cookie_path"
     proto = "http/1.1"
     case_id = "p1_cookie_path_match_redirect"
     case_variant = "lc_cookie_path_match_redirect_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_cookie_path"
+    trace_base = f"lc_{trace_id()}_cookie_path"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    url = f"http://localhost:{port}/login_path"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    url = f"http://localhost:{port}/login_path?"
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     baseline_cookie = tmp_path / "baseline.cookies"
     qcurl_cookie = tmp_path / "qcurl.cookies"
@@ -383,95 +374,82 @@ def test_p1_cookie_path_match_redirect_chain(env, lc_observe_http, tmp_path):
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--follow",
-                "--max-redirs",
-                "10",
-                "--cookiefile",
-                str(baseline_cookie),
-                "--cookiejar",
-                str(baseline_cookie),
-                baseline_url,
-            ],
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--follow",
+                    "--max-redirs",
+                    "10",
+                    "--cookiefile",
+                    str(baseline_cookie),
+                    "--cookiejar",
+                    str(baseline_cookie),
+                    baseline_url,
+                ],
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": case_id,
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_COOKIE_PATH": str(qcurl_cookie),
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=3)
+        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=3, start_offset=log_start)
         obs_list = _order_cookie_path_chain(obs_list)
         assert [o.method for o in obs_list] == ["GET", "GET", "GET"]
         assert [int(o.status) for o in obs_list] == [302, 302, 200]
         assert "sid" in _cookie_names_from_summary(str(obs_list[1].headers.get("cookie") or "")), "Path=/a 应发送 sid cookie"
         assert "sid" not in _cookie_names_from_summary(str(obs_list[2].headers.get("cookie") or "")), "Path 不匹配时不应发送 sid cookie"
 
-        baseline["payload"]["requests"] = [
-            build_request_semantic(obs.method, obs.url, obs.headers, b"")
-            for obs in obs_list
-        ]
-        baseline["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=baseline["payload"]["response"],
-            proto=proto,
+        _finalize_chain_payload(
+            baseline["payload"],
+            obs_list,
+            proto,
+            requests=[build_request_semantic(obs.method, obs.url, obs.headers, b"") for obs in obs_list],
         )
-        baseline["payload"]["request"]["method"] = obs_list[0].method
-        baseline["payload"]["request"]["url"] = obs_list[0].url
-        baseline["payload"]["request"]["headers"] = obs_list[0].headers
-        baseline["payload"]["response"]["status"] = obs_list[-1].status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs_list[-1].response_headers
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_COOKIE_PATH": str(qcurl_cookie),
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-
-        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=3)
+        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=3, start_offset=log_start)
         obs_list = _order_cookie_path_chain(obs_list)
-        qcurl["payload"]["requests"] = [
-            build_request_semantic(obs.method, obs.url, obs.headers, b"")
-            for obs in obs_list
-        ]
-        qcurl["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=qcurl["payload"]["response"],
-            proto=proto,
+        _finalize_chain_payload(
+            qcurl["payload"],
+            obs_list,
+            proto,
+            requests=[build_request_semantic(obs.method, obs.url, obs.headers, b"") for obs in obs_list],
         )
-        qcurl["payload"]["request"]["method"] = obs_list[0].method
-        qcurl["payload"]["request"]["url"] = obs_list[0].url
-        qcurl["payload"]["request"]["headers"] = obs_list[0].headers
-        qcurl["payload"]["response"]["status"] = obs_list[-1].status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs_list[-1].response_headers
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -490,23 +468,23 @@ def test_p1_cookie_path_match_redirect_chain(env, lc_observe_http, tmp_path):
         raise
 
 
-def test_p1_login_cookie_state_flow(env, lc_observe_http, tmp_path):
-    qt_path = require_qcurl_qttest()
+def test_p1_login_cookie_state_flow(env, lc_qt_path, lc_observe_http, tmp_path):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_login"
     proto = "http/1.1"
     case_variant = "lc_login_cookie_flow_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_login_cookie"
+    trace_base = f"lc_{trace_id()}_login_cookie"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    url = f"http://localhost:{port}/login"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    url = f"http://localhost:{port}/login?"
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     baseline_cookie = tmp_path / "baseline.cookies"
     qcurl_cookie = tmp_path / "qcurl.cookies"
@@ -516,96 +494,67 @@ def test_p1_login_cookie_state_flow(env, lc_observe_http, tmp_path):
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--follow",
-                "--max-redirs",
-                "10",
-                "--cookiefile",
-                str(baseline_cookie),
-                "--cookiejar",
-                str(baseline_cookie),
-                baseline_url,
-            ],
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--follow",
+                    "--max-redirs",
+                    "10",
+                    "--cookiefile",
+                    str(baseline_cookie),
+                    "--cookiejar",
+                    str(baseline_cookie),
+                    baseline_url,
+                ],
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p1_login_cookie_flow",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_COOKIE_PATH": str(qcurl_cookie),
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2)
+        obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2, start_offset=log_start)
         obs_list = _order_login_chain(obs_list)
-        baseline["payload"]["requests"] = [{
-            "method": obs.method,
-            "url": obs.url,
-            "headers": obs.headers,
-            "body_len": 0,
-            "body_sha256": "",
-        } for obs in obs_list]
-        baseline["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=baseline["payload"]["response"],
-            proto=proto,
-        )
-        baseline["payload"]["request"]["method"] = obs_list[0].method
-        baseline["payload"]["request"]["url"] = obs_list[0].url
-        baseline["payload"]["request"]["headers"] = obs_list[0].headers
-        baseline["payload"]["response"]["status"] = obs_list[-1].status
-        baseline["payload"]["response"]["http_version"] = proto
-        baseline["payload"]["response"]["headers"] = obs_list[-1].response_headers
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p1_login_cookie_flow",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_COOKIE_PATH": str(qcurl_cookie),
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
+        _finalize_chain_payload(baseline["payload"], obs_list, proto)
 
-        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2)
+        obs_list = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2, start_offset=log_start)
         obs_list = _order_login_chain(obs_list)
-        qcurl["payload"]["requests"] = [{
-            "method": obs.method,
-            "url": obs.url,
-            "headers": obs.headers,
-            "body_len": 0,
-            "body_sha256": "",
-        } for obs in obs_list]
-        qcurl["payload"]["responses"] = _responses_from_observed(
-            observed_list=obs_list,
-            final_response=qcurl["payload"]["response"],
-            proto=proto,
-        )
-        qcurl["payload"]["request"]["method"] = obs_list[0].method
-        qcurl["payload"]["request"]["url"] = obs_list[0].url
-        qcurl["payload"]["request"]["headers"] = obs_list[0].headers
-        qcurl["payload"]["response"]["status"] = obs_list[-1].status
-        qcurl["payload"]["response"]["http_version"] = proto
-        qcurl["payload"]["response"]["headers"] = obs_list[-1].response_headers
+        _finalize_chain_payload(qcurl["payload"], obs_list, proto)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
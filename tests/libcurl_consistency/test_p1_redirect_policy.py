@@ -7,7 +7,6 @@ P1：重定向策略控制一致性。
 from __future__ import annotations
 
 import os
-import re
 import uuid
 from pathlib import Path
 
@@ -16,6 +15,7 @@ import pytest
 from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
+    parse_curlcode_http_code,
     write_json,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
@@ -23,22 +23,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _responses_from_observed(*, observed_list, final_response, proto: str) -> list[dict]:
@@ -69,7 +54,7 @@ def test_p1_redirect_max_redirs_too_many_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect_policy"
     proto = "http/1.1"
@@ -81,8 +66,8 @@ def test_p1_redirect_max_redirs_too_many_http_1_1(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/redir/3"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 302, "http_version": proto, "headers": {}, "body": None}
 
@@ -99,7 +84,7 @@ def test_p1_redirect_max_redirs_too_many_http_1_1(env, lc_observe_http):
             download_count=1,
             allowed_exit_codes={0, 7},
         )
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
 
@@ -194,7 +179,7 @@ def test_p1_redirect_postredir_keep_post_301_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect_policy"
     proto = "http/1.1"
@@ -209,8 +194,8 @@ def test_p1_redirect_postredir_keep_post_301_http_1_1(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/redir_post_301"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -323,7 +308,7 @@ def test_p1_redirect_auto_referer_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect_policy"
     proto = "http/1.1"
@@ -335,8 +320,8 @@ def test_p1_redirect_auto_referer_http_1_1(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/redir/1"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -438,7 +423,7 @@ def test_p1_referer_explicit_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_redirect_policy"
     proto = "http/1.1"
@@ -452,8 +437,8 @@ def test_p1_referer_explicit_http_1_1(env, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/abs_target"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -550,8 +535,8 @@ def test_p1_unrestricted_sensitive_headers_redirect(unrestricted: bool, env, lc_
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port_a}/redir_abs?to_port={port_b}"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import os
 import uuid
-from pathlib import Path
 
 import pytest
 
@@ -19,11 +18,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _observed_request(obs) -> dict:
@@ -57,7 +52,7 @@ def test_p1_request_raw_headers_http_1_1(env, lc_logs, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_request_headers"
     proto = "http/1.1"
@@ -69,8 +64,8 @@ def test_p1_request_raw_headers_http_1_1(env, lc_logs, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/request_headers"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
     header_args = [
         "--header",
@@ -18,11 +18,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id, parse_observe_http_log
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def test_p1_resolve_override_http_1_1(env, lc_logs, lc_observe_http):
@@ -31,7 +27,7 @@ def test_p1_resolve_override_http_1_1(env, lc_logs, lc_observe_http):
     collect_logs = should_collect_service_logs()
 
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_network_path"
     proto = "http/1.1"
@@ -43,8 +39,8 @@ def test_p1_resolve_override_http_1_1(env, lc_logs, lc_observe_http):
 
     host = "example.invalid"
     url = f"http://{host}:{port}/status/200"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -142,8 +138,8 @@ def test_p1_connect_to_http_1_1(env, lc_logs, lc_observe_http_pair):
     host = "example.invalid"
     logical_port = 18080
     url = f"http://{host}:{logical_port}/status/200"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -9,8 +9,9 @@ from __future__ import annotations
 import hashlib
 import json
 import os
-import uuid
+from functools import partial
 from pathlib import Path
+from typing import Iterator
 
 import pytest
 
@@ -19,59 +20,82 @@ from tests.libcurl_consistency.pytest_support.artifacts import (
     build_request_semantic,
     ensure_case_dir,
     write_json,
+    write_results,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id, observe_log_offset
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+_VOLATILE_HEADER_PREFIXES = (b"date:", b"server:")
 
 
-def _normalize_raw_header_lines(raw: bytes) -> list[str]:
+def _iter_normalized_header_lines(path: Path) -> Iterator[str]:
     # headers 使用 latin-1 解码，尽量保持逐字节可比性，避免 utf-8 解码失败影响结果。
-    text = raw.decode("iso-8859-1", errors="replace")
-    out: list[str] = []
-    for line in text.splitlines():
-        line = line.rstrip("\r\n")
-        if not line:
-            continue
-        low = line.lower()
-        if low.startswith("date:") or low.startswith("server:"):
-            continue
-        out.append(line)
-    return out
+    # 以二进制逐行流式读取，不整体载入文件；每行再按 CRLF/CR/LF 切分，与 bytes.splitlines() 一致。
+    # 过滤 Date/Server 时只对行首 7 字节做大小写折叠。
+    with path.open("rb") as f:
+        for chunk in f:
+            for line in chunk.splitlines():
+                if not line:
+                    continue
+                if line[:7].lower().startswith(_VOLATILE_HEADER_PREFIXES):
+                    continue
+                yield line.decode("iso-8859-1")
 
 
 def _raw_header_fields(lines: list[str]) -> dict:
-    blob = "\n".join(lines).encode("utf-8")
+    # 与 "\n".join(lines).encode("utf-8") 的 len/sha256 等价，但逐行增量喂给哈希，不拼接整块 blob。
+    h = hashlib.sha256()
+    total = 0
+    for idx, line in enumerate(lines):
+        if idx:
+            h.update(b"\n")
+            total += 1
+        data = line.encode("utf-8")
+        h.update(data)
+        total += len(data)
     return {
         "headers_raw_lines": lines,
-        "headers_raw_len": int(len(blob)),
-        "headers_raw_sha256": hashlib.sha256(blob).hexdigest(),
+        "headers_raw_len": total,
+        "headers_raw_sha256": h.hexdigest(),
     }
 
 
+def _header_buckets(lines: list[str]) -> dict[str, list[str]]:
+    # 单次遍历按 header 名（小写）分桶；只对冒号前的名字做 lower，而非整行。
+    buckets: dict[str, list[str]] = {}
+    for line in lines:
+        name, sep, _ = line.partition(":")
+        if sep:
+            buckets.setdefault(name.lower(), []).append(line)
+    return buckets
+
+
 def _assert_server_headers_shape(lines: list[str]) -> None:
     # 该断言用于避免“对比器或用例失效却仍然通过”的情况，例如意外未采集到 headers。
-    set_cookie = [l for l in lines if l.lower().startswith("set-cookie:")]
-    x_dupe = [l for l in lines if l.lower().startswith("x-dupe:")]
+    buckets = _header_buckets(lines)
+    set_cookie = buckets.get("set-cookie", [])
+    x_dupe = buckets.get("x-dupe", [])
+    x_case = buckets.get("x-case", [])
     assert len(set_cookie) == 2, f"Set-Cookie 行数异常: {set_cookie}"
     assert len(x_dupe) == 2, f"X-Dupe 行数异常: {x_dupe}"
-    assert "X-Case: A" in lines, "缺少 X-Case: A"
-    assert "x-case: b" in lines, "缺少 x-case: b"
+    assert "X-Case: A" in x_case, "缺少 X-Case: A"
+    assert "x-case: b" in x_case, "缺少 x-case: b"
 
 
 def _hes_raw_headers_payload(lines: list[str]) -> dict:
+    buckets = _header_buckets(lines)
     return {
         "kind": "raw_headers",
         **_raw_header_fields(lines),
-        "set_cookie_count": len([line for line in lines if line.lower().startswith("set-cookie:")]),
-        "x_dupe_count": len([line for line in lines if line.lower().startswith("x-dupe:")]),
+        "set_cookie_count": len(buckets.get("set-cookie", [])),
+        "x_dupe_count": len(buckets.get("x-dupe", [])),
     }
 
 def _parse_curl_easy_header_stdout(lines: list[str]) -> dict[str, object]:
@@ -117,24 +141,22 @@ def _parse_curl_easy_header_stdout(lines: list[str]) -> dict[str, object]:
     return out
 
 
-def test_p1_resp_headers_raw(env, lc_logs, lc_observe_http, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p1_resp_headers_raw(env, lc_qt_path, lc_logs, lc_observe_http, tmp_path):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_resp_headers"
     proto = "http/1.1"
     case_variant = "p1_resp_headers_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_resp_headers"
+    trace_base = f"lc_{trace_id()}_resp_headers"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    base_url = f"http://localhost:{port}/resp_headers"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    base_url = f"http://localhost:{port}/resp_headers?"
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     case_dir = ensure_case_dir(artifacts_root(env), suite=suite, case=case_variant)
     baseline_header_file = case_dir / "baseline_response_headers.data"
@@ -142,67 +164,75 @@ def test_p1_resp_headers_raw(env, lc_logs, lc_observe_http, tmp_path):
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--header-out",
-                str(baseline_header_file),
-                baseline_url,
-            ],
-            request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--header-out",
+                    str(baseline_header_file),
+                    baseline_url,
+                ],
+                request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p1_resp_headers",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
+
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
         baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
         baseline["payload"]["response"]["headers"] = obs.response_headers
-        raw_lines = _normalize_raw_header_lines(baseline_header_file.read_bytes())
+        raw_lines = list(_iter_normalized_header_lines(baseline_header_file))
         _assert_server_headers_shape(raw_lines)
         baseline["payload"]["response"].update(_raw_header_fields(raw_lines))
         baseline["payload"]["hes"] = _hes_raw_headers_payload(raw_lines)
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p1_resp_headers",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
         qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
         qcurl["payload"]["response"]["headers"] = obs.response_headers
 
         qcurl_header_file = qcurl["path"].parent / "qcurl_run" / "response_headers_0.data"
-        raw_lines = _normalize_raw_header_lines(qcurl_header_file.read_bytes())
+        raw_lines = list(_iter_normalized_header_lines(qcurl_header_file))
         _assert_server_headers_shape(raw_lines)
         qcurl["payload"]["response"].update(_raw_header_fields(raw_lines))
         qcurl["payload"]["hes"] = _hes_raw_headers_payload(raw_lines)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -221,69 +251,73 @@ def test_p1_resp_headers_raw(env, lc_logs, lc_observe_http, tmp_path):
         raise
 
 
-def test_p1_resp_headers_unfold_1940(env, lc_logs, lc_observe_http, tmp_path):
+def test_p1_resp_headers_unfold_1940(env, lc_qt_path, lc_logs, lc_observe_http, tmp_path):
     """
     P1：响应头 unfold 一致性（curl test1940 语义来源：折叠行 + TAB 的 curl_easy_header 可观测值）。
 
     基线：lib1940（curl_easy_header 输出到 stdout）
     QCurl：Qt Test（resp_headers_unfold_1940，落盘 headers_unfolded_1940.json）
     """
-    qt_path = require_qcurl_qttest()
-
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_resp_headers"
     proto = "http/1.1"
     case_variant = "p1_resp_headers_unfold_1940_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_resp_headers_unfold_1940"
+    trace_base = f"lc_{trace_id()}_resp_headers_unfold_1940"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    base_url = f"http://localhost:{port}/resp_headers?scenario=1940"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    base_url = f"http://localhost:{port}/resp_headers?scenario=1940&"
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="lib1940",
-            args=[baseline_url],
-            request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="lib1940",
+                args=[baseline_url],
+                request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                case_env={
+                    "QCURL_LC_CASE_ID": "resp_headers_unfold_1940",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
+
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
         baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
         baseline_unfolded = _parse_curl_easy_header_stdout(baseline["payload"]["stdout"])
         baseline["payload"]["headers_unfolded_1940"] = baseline_unfolded
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            case_env={
-                "QCURL_LC_CASE_ID": "resp_headers_unfold_1940",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
         qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
@@ -291,6 +325,7 @@ def test_p1_resp_headers_unfold_1940(env, lc_logs, lc_observe_http, tmp_path):
         qcurl_unfolded_path = qcurl["path"].parent / "qcurl_run" / "headers_unfolded_1940.json"
         qcurl_unfolded = json.loads(qcurl_unfolded_path.read_text(encoding="utf-8"))
         qcurl["payload"]["headers_unfolded_1940"] = qcurl_unfolded
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
         qcurl_unfolded_for_compare = {
@@ -299,8 +334,9 @@ def test_p1_resp_headers_unfold_1940(env, lc_logs, lc_observe_http, tmp_path):
             if not (v == "" and k not in baseline_unfolded)
         }
         assert baseline_unfolded == qcurl_unfolded_for_compare
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
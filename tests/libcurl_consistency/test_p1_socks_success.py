@@ -17,11 +17,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _last_socks_entry(path: Path) -> dict:
@@ -54,7 +50,7 @@ def test_p1_socks_success_http_1_1(mode, proxy_type, target_host, expected_atyp,
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
     proxy_port = int(lc_socks5_success_proxy["port"])
     proxy_log = Path(str(lc_socks5_success_proxy["log_file"]))
 
@@ -68,8 +64,8 @@ def test_p1_socks_success_http_1_1(mode, proxy_type, target_host, expected_atyp,
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://{target_host}:{port}/empty_200"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
     proxy = f"127.0.0.1:{proxy_port}"
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
@@ -7,38 +7,25 @@ P1：超时语义一致性。
 from __future__ import annotations
 
 import os
-import re
-import uuid
-from pathlib import Path
+from functools import partial
 
 import pytest
 
 from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
+    parse_curlcode_http_code,
     write_json,
+    write_results,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id, observe_log_offset
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 @pytest.mark.parametrize(
@@ -46,14 +33,14 @@ def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
     [
         (
             "p1_timeout_delay_headers",
-            "/delay_headers/1000",
-            ["--timeout-ms", "200"],
+            "/delay_headers/500",
+            ["--timeout-ms", "100"],
             0,
         ),
         (
             "p1_timeout_low_speed",
-            "/stall_body/8192/5000",
-            ["--low-speed-time", "2", "--low-speed-limit", "1024"],
+            "/stall_body/8192/4000",
+            ["--low-speed-time", "1", "--low-speed-limit", "1024"],
             200,
         ),
     ],
@@ -63,55 +50,77 @@ def test_p1_timeouts(case_id: str,
                      baseline_args: list[str],
                      expected_http_code: int,
                      env,
+                     lc_qt_path,
                      lc_logs,
                      lc_observe_http,
                      tmp_path):
-    qt_path = require_qcurl_qttest()
-
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_timeouts"
     proto = "http/1.1"
     case_variant = f"{case_id}_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
     base_url = f"http://localhost:{port}{path}"
-    baseline_url = _append_req_id(base_url, baseline_req_id)
-    qcurl_url = _append_req_id(base_url, qcurl_req_id)
+    baseline_url = append_req_id(base_url, baseline_req_id)
+    qcurl_url = append_req_id(base_url, qcurl_req_id)
 
     # status=0 表示“尚未收到响应头”，用于对齐 libcurl 的 http_code=0 可观测口径。
     expected_status = 0 if expected_http_code == 0 else 200
     resp_meta = {"status": expected_status, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                *baseline_args,
-                baseline_url,
-            ],
-            request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            allowed_exit_codes={0, 7},
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    *baseline_args,
+                    baseline_url,
+                ],
+                request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                allowed_exit_codes={0, 7},
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": case_id,
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
 
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
         baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
@@ -123,27 +132,8 @@ def test_p1_timeouts(case_id: str,
             curlcode=curlcode,
             http_code=http_code,
         )
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": case_id,
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
 
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
         qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
@@ -158,12 +148,14 @@ def test_p1_timeouts(case_id: str,
             curlcode=28,
             http_code=obs.status,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
         assert baseline["payload"]["observed"]["error"]["http_code"] == expected_http_code
         assert qcurl["payload"]["observed"]["error"]["http_code"] == expected_http_code
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -7,7 +7,6 @@ seekable body 应允许重发；non-seekable body 应显式失败，不得静默
 from __future__ import annotations
 
 import os
-import re
 import uuid
 from pathlib import Path
 
@@ -19,10 +18,14 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, sha256_bytes, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import (
+    apply_error_namespaces,
+    parse_curlcode_http_code,
+    sha256_bytes,
+    write_json,
+)
 
 
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
 guard_planned_test(Path(__file__).name)
 
 
@@ -39,14 +42,6 @@ def _response_sha_empty() -> str:
     return sha256_bytes(b"")
 
 
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines or []:
-        m = _CURLINFO_RE.search(str(line))
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
 @pytest.mark.parametrize("seekable", [False, True])
 @pytest.mark.parametrize("method", ["POST", "PUT"])
 def test_p1_stream_body_redirect_307_replay(seekable: bool, method: str, env, lc_observe_http):
@@ -59,7 +54,7 @@ def test_p1_stream_body_redirect_307_replay(seekable: bool, method: str, env, lc
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_upload_seek"
     proto = "http/1.1"
@@ -222,7 +217,7 @@ def test_p1_stream_body_httpauth_anysafe_digest_replay(seekable: bool, env, lc_o
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p1_upload_seek"
     proto = "http/1.1"
@@ -277,7 +272,7 @@ def test_p1_stream_body_httpauth_anysafe_digest_replay(seekable: bool, env, lc_o
             download_count=1,
             allowed_exit_codes={0, 7},
         )
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
         if expect_success:
@@ -12,14 +12,13 @@ P2：下载 backpressure 一致性（可观测数据层面最小合同）。
 
 from __future__ import annotations
 
-import json
 import os
 import uuid
 from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, read_json, write_json
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id
@@ -27,10 +26,6 @@ from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def test_p2_backpressure_contract_h2(env, lc_logs):
     qt_path = require_qcurl_qttest()
 
@@ -85,7 +80,7 @@ def test_p2_backpressure_contract_h2(env, lc_logs):
         baseline["payload"]["request"]["headers"] = obs.headers
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = obs.http_version
-        baseline["payload"]["backpressure_contract"] = _load_json(baseline_events)
+        baseline["payload"]["backpressure_contract"] = read_json(baseline_events)
         write_json(baseline["path"], baseline["payload"])
 
         qcurl = run_qt_test(
@@ -117,7 +112,7 @@ def test_p2_backpressure_contract_h2(env, lc_logs):
         qcurl["payload"]["response"]["http_version"] = obs.http_version
 
         qcurl_events_path = qcurl["path"].parent / "qcurl_run" / "backpressure_events.json"
-        qcurl["payload"]["backpressure_contract"] = _load_json(qcurl_events_path)
+        qcurl["payload"]["backpressure_contract"] = read_json(qcurl_events_path)
         write_json(qcurl["path"], qcurl["payload"])
 
         assert_artifacts_match(baseline["path"], qcurl["path"])
@@ -11,7 +11,7 @@ import os
 import uuid
 from pathlib import Path
 from typing import Dict, List
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+from urllib.parse import urlsplit, urlunsplit
 
 import pytest
 
@@ -19,24 +19,13 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-from tests.libcurl_consistency.pytest_support.artifacts import write_json
+from tests.libcurl_consistency.pytest_support.artifacts import read_json, write_json
 
 
 if os.environ.get("QCURL_LC_EXT", "").strip() != "1":
     pytest.skip("该扩展用例仅在 QCURL_LC_EXT=1 时启用", allow_module_level=True)
 
 
-def _strip_query_id(url: str) -> str:
-    parts = urlsplit(url)
-    query = parse_qs(parts.query, keep_blank_values=True)
-    query.pop("id", None)
-    return urlunsplit(("", "", parts.path, urlencode(query, doseq=True), ""))
-
-
-def _load_json(path: Path) -> Dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def _load_jsonl(path: Path) -> List[Dict]:
     if not path.exists():
         return []
@@ -124,7 +113,7 @@ def test_p2_connection_limits_contract(env, lc_logs, lc_observe_http, tmp_path):
 
     qcurl_summary = tmp_path / "qcurl_connection_summary.json"
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     baseline_url = f"http://localhost:{port}/empty_200?id={baseline_req_id}"
     qcurl_url = f"http://localhost:{port}/empty_200?slot=0001&id={qcurl_req_id}"
@@ -194,7 +183,7 @@ def test_p2_connection_limits_contract(env, lc_logs, lc_observe_http, tmp_path):
                 f"observe http log 记录数不匹配（qcurl）: got={len(qcurl_entries)}, expected={repeat}"
             )
         qcurl_conn = _observed_connection(qcurl_entries)
-        qcurl_internal_conn = _qcurl_connection_observed(_load_json(qcurl_summary), expected_count=repeat)
+        qcurl_internal_conn = _qcurl_connection_observed(read_json(qcurl_summary), expected_count=repeat)
         qcurl["payload"]["request"]["url"] = _strip_all_query(str(qcurl["payload"]["request"]["url"] or ""))
         qcurl["payload"]["connection_observed"] = qcurl_conn
         write_json(qcurl["path"], qcurl["payload"])
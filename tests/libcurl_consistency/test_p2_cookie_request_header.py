@@ -24,11 +24,7 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def _seed_cookiefile(path: Path, host: str) -> None:
@@ -68,7 +64,7 @@ def test_p2_cookie_request_header(env, lc_logs, lc_observe_http, tmp_path):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_cookie_header"
     proto = "http/1.1"
@@ -79,7 +75,7 @@ def test_p2_cookie_request_header(env, lc_logs, lc_observe_http, tmp_path):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/cookie"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
 
     baseline_cookie = tmp_path / "baseline.cookies"
     qcurl_cookie = tmp_path / "qcurl.cookies"
@@ -126,7 +122,7 @@ def test_p2_cookie_request_header(env, lc_logs, lc_observe_http, tmp_path):
         write_json(baseline["path"], baseline["payload"])
 
         observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
+        qcurl_url = append_req_id(url, qcurl_req_id)
         qcurl = run_qt_test(
             env=env,
             suite=suite,
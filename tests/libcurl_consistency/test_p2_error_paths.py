@@ -7,59 +7,32 @@ P2：错误路径一致性。
 from __future__ import annotations
 
 import os
-import re
-import uuid
+from functools import partial
 from pathlib import Path
-from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import pytest
 
 from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
+    parse_curlcode_http_code,
     write_json,
+    write_results,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.observed import observe_log_offset, parse_proxy_log
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id, strip_query_id_keep_origin
 
 
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _strip_query_id_keep_origin(url: str) -> str:
-    parts = urlsplit(url)
-    q = parse_qs(parts.query, keep_blank_values=True)
-    q.pop("id", None)
-    query = urlencode(q, doseq=True)
-    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, parts.fragment))
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-def _proxy_observed_for_id_any(proxy_log: Path, req_id: str) -> tuple[str, str, dict]:
+def _proxy_observed_for_id_any(proxy_log: Path, req_id: str, *, start_offset: int = 0) -> tuple[str, str, dict]:
     if not proxy_log.exists():
         raise AssertionError(f"proxy log 不存在: {proxy_log}")
-    for raw in proxy_log.read_text(encoding="utf-8", errors="replace").splitlines():
-        if not raw.strip():
-            continue
-        try:
-            import json
-
-            e = json.loads(raw)
-        except Exception:
-            continue
+    for e in parse_proxy_log(proxy_log, start_offset=start_offset, req_id=req_id):
         if (e.get("id") or "") != req_id:
             continue
         method = str(e.get("method") or "").upper()
@@ -73,14 +46,12 @@ def _proxy_observed_for_id_any(proxy_log: Path, req_id: str) -> tuple[str, str,
                 headers_allowlist[name] = v
         url = target
         if method != "CONNECT":
-            url = _strip_query_id_keep_origin(target)
+            url = strip_query_id_keep_origin(target)
         return method, url, headers_allowlist
     raise AssertionError(f"proxy log 无匹配记录：id={req_id}, file={proxy_log}")
 
 
-def test_p2_error_connect_refused(env, lc_logs, free_tcp_port, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_error_connect_refused(env, lc_qt_path, lc_logs, free_tcp_port, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p2_error_paths"
     proto = "http/1.1"
@@ -89,25 +60,47 @@ def test_p2_error_connect_refused(env, lc_logs, free_tcp_port, tmp_path):
     url = f"http://localhost:{int(free_tcp_port)}/"
     resp_meta = {"status": 0, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--connect-timeout-ms",
-                "200",
-                url,
-            ],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            allowed_exit_codes={0, 7},
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--connect-timeout-ms",
+                    "200",
+                    url,
+                ],
+                request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                allowed_exit_codes={0, 7},
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p2_error_refused",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_TARGET_URL": url,
+                },
+                persist=False,
+            ),
         )
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
         apply_error_namespaces(
@@ -117,23 +110,6 @@ def test_p2_error_connect_refused(env, lc_logs, free_tcp_port, tmp_path):
             curlcode=curlcode,
             http_code=http_code,
         )
-        write_json(baseline["path"], baseline["payload"])
-
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p2_error_refused",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_TARGET_URL": url,
-            },
-        )
         # QCurl 对该错误的可观测输出为 NetworkError::ConnectionRefused（映射自 CURLE_COULDNT_CONNECT=7）
         apply_error_namespaces(
             qcurl["payload"],
@@ -142,10 +118,12 @@ def test_p2_error_connect_refused(env, lc_logs, free_tcp_port, tmp_path):
             curlcode=7,
             http_code=0,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -162,9 +140,7 @@ def test_p2_error_connect_refused(env, lc_logs, free_tcp_port, tmp_path):
         raise
 
 
-def test_p2_error_url_malformat(env, lc_logs, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_error_url_malformat(env, lc_qt_path, lc_logs, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p2_error_paths"
     proto = "http/1.1"
@@ -173,23 +149,45 @@ def test_p2_error_url_malformat(env, lc_logs, tmp_path):
     url = "http://"
     resp_meta = {"status": 0, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                url,
-            ],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            allowed_exit_codes={0, 7},
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    url,
+                ],
+                request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                allowed_exit_codes={0, 7},
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p2_error_malformat",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_TARGET_URL": url,
+                },
+                persist=False,
+            ),
         )
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
         apply_error_namespaces(
@@ -199,23 +197,6 @@ def test_p2_error_url_malformat(env, lc_logs, tmp_path):
             curlcode=curlcode,
             http_code=http_code,
         )
-        write_json(baseline["path"], baseline["payload"])
-
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p2_error_malformat",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_TARGET_URL": url,
-            },
-        )
         # QCurl 对该错误的可观测输出为 NetworkError::InvalidRequest（映射自 CURLE_URL_MALFORMAT=3）
         apply_error_namespaces(
             qcurl["payload"],
@@ -224,10 +205,12 @@ def test_p2_error_url_malformat(env, lc_logs, tmp_path):
             curlcode=3,
             http_code=0,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -244,49 +227,70 @@ def test_p2_error_url_malformat(env, lc_logs, tmp_path):
         raise
 
 
-def test_p2_error_proxy_407(env, lc_logs, lc_http_proxy, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_error_proxy_407(env, lc_qt_path, lc_logs, lc_http_proxy, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p2_error_paths"
     proto = "http/1.1"
     case_variant = "p2_error_proxy_407_http_1.1"
 
-    proxy_port = int(lc_http_proxy["port"])
-    proxy_log = Path(str(lc_http_proxy["log_file"]))
-    proxy_url = f"http://localhost:{proxy_port}"
+    proxy_port = lc_http_proxy["port"]
+    proxy_log = lc_http_proxy["log_file"]
+    proxy_url = lc_http_proxy["url"]
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_proxy_407"
+    trace_base = f"lc_{trace_id()}_proxy_407"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
-    target = _append_req_id(f"http://localhost:{int(env.http_port)}/", baseline_req_id)
-    qcurl_target = _append_req_id(f"http://localhost:{int(env.http_port)}/", qcurl_req_id)
+    target = append_req_id(f"http://localhost:{int(env.http_port)}/", baseline_req_id)
+    qcurl_target = append_req_id(f"http://localhost:{int(env.http_port)}/", qcurl_req_id)
 
     resp_meta = {"status": 407, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        proxy_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--proxy",
-                proxy_url,
-                target,
-            ],
-            request_meta={"method": "GET", "url": target, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(proxy_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--proxy",
+                    proxy_url,
+                    target,
+                ],
+                request_meta={"method": "GET", "url": target, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_target, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p2_error_proxy_407",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_PROXY_PORT": str(proxy_port),
+                    "QCURL_LC_PROXY_TARGET_URL": qcurl_target,
+                },
+                persist=False,
+            ),
         )
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         if curlcode < 0:
             raise AssertionError("baseline stderr 未包含 curlcode/http_code")
-        method, url_no_id, hdrs = _proxy_observed_for_id_any(proxy_log, baseline_req_id)
+        method, url_no_id, hdrs = _proxy_observed_for_id_any(proxy_log, baseline_req_id, start_offset=log_start)
         baseline["payload"]["requests"] = [build_request_semantic(method, url_no_id, hdrs, b"")]
         baseline["payload"]["response"]["status"] = 407
         baseline["payload"]["response"]["http_version"] = proto
@@ -297,26 +301,8 @@ def test_p2_error_proxy_407(env, lc_logs, lc_http_proxy, tmp_path):
             curlcode=curlcode,
             http_code=http_code,
         )
-        write_json(baseline["path"], baseline["payload"])
 
-        proxy_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_target, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p2_error_proxy_407",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_PROXY_PORT": str(proxy_port),
-                "QCURL_LC_PROXY_TARGET_URL": qcurl_target,
-            },
-        )
-        method, url_no_id, hdrs = _proxy_observed_for_id_any(proxy_log, qcurl_req_id)
+        method, url_no_id, hdrs = _proxy_observed_for_id_any(proxy_log, qcurl_req_id, start_offset=log_start)
         qcurl["payload"]["requests"] = [build_request_semantic(method, url_no_id, hdrs, b"")]
         qcurl["payload"]["response"]["status"] = 407
         qcurl["payload"]["response"]["http_version"] = proto
@@ -327,10 +313,12 @@ def test_p2_error_proxy_407(env, lc_logs, lc_http_proxy, tmp_path):
             curlcode=0,
             http_code=407,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -18,12 +18,9 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
 def _env_int(name: str, default: int) -> int:
     raw = (os.environ.get(name) or "").strip()
     if not raw:
@@ -61,7 +58,7 @@ def _run_expect100_417_retry_once(
     baseline_args_extra: list[str],
 ) -> dict[str, str]:
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     body = b"x" * upload_size
     trace_base = f"lc_{uuid.uuid4().hex[:8]}_expect100"
@@ -75,7 +72,7 @@ def _run_expect100_417_retry_once(
     }
 
     url = f"http://localhost:{port}/expect_417"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
     observe_log.write_text("", encoding="utf-8")
@@ -143,7 +140,7 @@ def _run_expect100_417_retry_once(
     write_json(baseline["path"], baseline["payload"])
 
     observe_log.write_text("", encoding="utf-8")
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
     qcurl = run_qt_test(
         env=env,
         suite=suite,
@@ -238,7 +235,7 @@ def test_p2_expect_100_continue_417_retry(env, lc_observe_http):
                 env,
                 suite=suite,
                 case=case_variant,
-                logs={"observe_http_log": Path(str(lc_observe_http["log_file"]))},
+                logs={"observe_http_log": lc_observe_http["log_file"]},
                 meta={
                     "case_id": case_id,
                     "case_variant": case_variant,
@@ -292,7 +289,7 @@ def test_p2_expect_100_continue_417_retry_repeat_inprocess(env, lc_observe_http)
                     env,
                     suite=suite,
                     case=case_variant,
-                    logs={"observe_http_log": Path(str(lc_observe_http["log_file"]))},
+                    logs={"observe_http_log": lc_observe_http["log_file"]},
                     meta={
                         "case_id": case_id,
                         "case_variant": case_variant,
@@ -343,7 +340,7 @@ def test_p2_expect_100_continue_417_retry_inline_body(env, lc_observe_http):
                 env,
                 suite=suite,
                 case=case_variant,
-                logs={"observe_http_log": Path(str(lc_observe_http["log_file"]))},
+                logs={"observe_http_log": lc_observe_http["log_file"]},
                 meta={
                     "case_id": case_id,
                     "case_variant": case_variant,
@@ -7,8 +7,7 @@ P2：固定 HTTP 错误码一致性。
 from __future__ import annotations
 
 import os
-import uuid
-from pathlib import Path
+from functools import partial
 
 import pytest
 
@@ -16,62 +15,85 @@ from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
     write_json,
+    write_results,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
 from tests.libcurl_consistency.pytest_support.observed import (
     observe_http_observed_for_id,
     observe_http_observed_list_for_id,
+    observe_log_offset,
 )
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 @pytest.mark.parametrize("status_code", [404, 401, 503])
-def test_p2_fixed_http_errors(status_code: int, env, lc_logs, lc_observe_http, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_fixed_http_errors(status_code: int, env, lc_qt_path, lc_logs, lc_observe_http, tmp_path):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_fixed_http_errors"
     proto = "http/1.1"
     case_variant = f"lc_status_{status_code}_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_status_{status_code}"
+    trace_base = f"lc_{trace_id()}_status_{status_code}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/status/{status_code}"
-    baseline_url = _append_req_id(url, baseline_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": status_code, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                baseline_url,
-            ],
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    baseline_url,
+                ],
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p2_fixed_http_error",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                    "QCURL_LC_STATUS_CODE": str(status_code),
+                },
+                persist=False,
+            ),
         )
 
-        obs = observe_http_observed_for_id(observe_log, baseline_req_id)
+        obs = observe_http_observed_for_id(observe_log, baseline_req_id, start_offset=log_start)
         baseline["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = proto
@@ -82,29 +104,8 @@ def test_p2_fixed_http_errors(status_code: int, env, lc_logs, lc_observe_http, t
             http_status=obs.status,
             http_code=obs.status,
         )
-        write_json(baseline["path"], baseline["payload"])
-
-        observe_log.write_text("", encoding="utf-8")
-        qcurl_url = _append_req_id(url, qcurl_req_id)
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p2_fixed_http_error",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-                "QCURL_LC_STATUS_CODE": str(status_code),
-            },
-        )
 
-        obs = observe_http_observed_for_id(observe_log, qcurl_req_id)
+        obs = observe_http_observed_for_id(observe_log, qcurl_req_id, start_offset=log_start)
         qcurl["payload"]["request"] = build_request_semantic(obs.method, obs.url, obs.headers, b"")
         qcurl["payload"]["response"]["status"] = obs.status
         qcurl["payload"]["response"]["http_version"] = proto
@@ -115,10 +116,12 @@ def test_p2_fixed_http_errors(status_code: int, env, lc_logs, lc_observe_http, t
             http_status=obs.status,
             http_code=obs.status,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -138,49 +141,70 @@ def test_p2_fixed_http_errors(status_code: int, env, lc_logs, lc_observe_http, t
         raise
 
 
-def test_p2_retry_501_sequence_http_1_1(env, lc_logs, lc_observe_http, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_retry_501_sequence_http_1_1(env, lc_qt_path, lc_logs, lc_observe_http, tmp_path):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_fixed_http_errors"
     proto = "http/1.1"
     status_code = 501
     case_variant = "p2_retry_501_sequence_http_1.1"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_retry_501_seq"
+    trace_base = f"lc_{trace_id()}_retry_501_seq"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/status/{status_code}"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     req_meta = {"method": "GET", "url": baseline_url, "headers": {}, "body": b""}
     resp_meta = {"status": status_code, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
-        observe_log.write_text("", encoding="utf-8")
-        baseline = run_libtest_case(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            client_name="cli_lc_http",
-            args=[
-                "-V",
-                proto,
-                "--repeat",
-                "2",
-                baseline_url,
-            ],
-            request_meta=req_meta,
-            response_meta=resp_meta,
-            download_count=1,
+        log_start = observe_log_offset(observe_log)
+        baseline, qcurl = run_pair(
+            partial(
+                run_libtest_case,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                client_name="cli_lc_http",
+                args=[
+                    "-V",
+                    proto,
+                    "--repeat",
+                    "2",
+                    baseline_url,
+                ],
+                request_meta=req_meta,
+                response_meta=resp_meta,
+                download_count=1,
+                persist=False,
+            ),
+            partial(
+                run_qt_test,
+                env=env,
+                suite=suite,
+                case=case_variant,
+                qt_executable=lc_qt_path,
+                args=[],
+                request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
+                response_meta=resp_meta,
+                download_count=1,
+                case_env={
+                    "QCURL_LC_CASE_ID": "p2_retry_501_sequence",
+                    "QCURL_LC_PROTO": proto,
+                    "QCURL_LC_REQ_ID": qcurl_req_id,
+                    "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
+                },
+                persist=False,
+            ),
         )
 
-        observed = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2)
+        observed = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=2, start_offset=log_start)
         baseline["payload"]["requests"] = [
             build_request_semantic(o.method, o.url, o.headers, b"") for o in observed
         ]
@@ -200,27 +224,8 @@ def test_p2_retry_501_sequence_http_1_1(env, lc_logs, lc_observe_http, tmp_path)
             http_status=status_code,
             http_code=status_code,
         )
-        write_json(baseline["path"], baseline["payload"])
 
-        observe_log.write_text("", encoding="utf-8")
-        qcurl = run_qt_test(
-            env=env,
-            suite=suite,
-            case=case_variant,
-            qt_executable=qt_path,
-            args=[],
-            request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
-            response_meta=resp_meta,
-            download_count=1,
-            case_env={
-                "QCURL_LC_CASE_ID": "p2_retry_501_sequence",
-                "QCURL_LC_PROTO": proto,
-                "QCURL_LC_REQ_ID": qcurl_req_id,
-                "QCURL_LC_OBSERVE_HTTP_PORT": str(port),
-            },
-        )
-
-        observed = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2)
+        observed = observe_http_observed_list_for_id(observe_log, qcurl_req_id, expected_count=2, start_offset=log_start)
         qcurl["payload"]["requests"] = [
             build_request_semantic(o.method, o.url, o.headers, b"") for o in observed
         ]
@@ -240,10 +245,12 @@ def test_p2_retry_501_sequence_http_1_1(env, lc_logs, lc_observe_http, tmp_path)
             http_status=status_code,
             http_code=status_code,
         )
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
-    except Exception:
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
+    except Exception as exc:
+        write_results(*pair_results(exc, baseline, qcurl))
         if collect_logs:
             collect_service_logs_for_case(
                 env,
@@ -6,62 +6,68 @@ P2：pause/resume 弱判据一致性。
 
 from __future__ import annotations
 
-import json
 import os
 import re
-import uuid
 from pathlib import Path
+from typing import Iterable
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import write_json
+from tests.libcurl_consistency.pytest_support.artifacts import read_json, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
 from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
 _RECV_RE = re.compile(r"^\[t-(\d+)\]\s+RECV\s+(\d+)\s+bytes,\s+total=(\d+),\s+pause_at=(\d+)")
+_T0_PREFIX = "[t-0] "
 
 
-def _parse_pause_resume(stderr_lines: list[str], *, pause_offset: int) -> dict:
+def _parse_pause_resume(stderr_lines: Iterable[str], *, pause_offset: int) -> dict:
     pause_count = 0
     resume_count = 0
-    finished_idx = -1
+    finished_seen = False
 
     paused_total = -1
     last_total = -1
     paused_total_increase_events = 0
     in_pause = False
 
-    for idx, line in enumerate(stderr_lines or []):
-        m = _RECV_RE.match(line.strip())
-        if m and m.group(1) == "0":
-            last_total = int(m.group(3))
-            if in_pause and paused_total >= 0 and last_total > paused_total:
-                paused_total_increase_events += 1
-                paused_total = last_total
-
-        if "[t-0] PAUSE" in line:
+    for raw in stderr_lines:
+        # 只关心 transfer 0 的事件行：先按前缀过滤，再按事件名分派，RECV 行才走正则
+        line = raw.strip()
+        if not line.startswith(_T0_PREFIX):
+            continue
+        event = line[len(_T0_PREFIX):]
+
+        if event.startswith("RECV"):
+            m = _RECV_RE.match(line)
+            if m:
+                last_total = int(m.group(3))
+                if in_pause and paused_total >= 0 and last_total > paused_total:
+                    paused_total_increase_events += 1
+                    paused_total = last_total
+        elif event.startswith("PAUSE"):
             pause_count += 1
             in_pause = True
             # PAUSE 发生在某次 RECV 回调内部；以“上一条 RECV 的 total”为暂停时刻已落盘字节
             if paused_total < 0 and last_total >= 0:
                 paused_total = last_total
-        if "[t-0] RESUMED" in line:
+        elif event.startswith("RESUMED"):
             resume_count += 1
             in_pause = False
-        if "[t-0] FINISHED" in line:
-            if finished_idx < 0:
-                finished_idx = idx
+        elif event.startswith("FINISHED"):
+            finished_seen = True
 
     event_seq: list[str] = []
     if pause_count > 0:
         event_seq.append("pause")
     if resume_count > 0:
         event_seq.append("resume")
-    if finished_idx >= 0:
+    if finished_seen:
         event_seq.append("finished")
 
     return {
@@ -75,9 +81,7 @@ def _parse_pause_resume(stderr_lines: list[str], *, pause_offset: int) -> dict:
     }
 
 
-def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_pause_resume_h2(env, lc_qt_path, lc_logs, lc_access_log_index, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p2_pause_resume"
     proto = "h2"
@@ -87,7 +91,7 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
     pause_offset = 100 * 1023
     docname = "data-1m"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
@@ -95,6 +99,7 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
     qcurl_url = f"https://localhost:{int(env.https_port)}/{docname}?id={qcurl_req_id}"
     resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
 
+    baseline = qcurl = None
     try:
         baseline = run_libtest_case(
             env=env,
@@ -115,10 +120,12 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
             request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
             response_meta=resp_meta,
             download_count=1,
+            persist=False,
         )
 
         access_log = Path(lc_logs["httpd_access_log"])
-        obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False)
+        access_index = lc_access_log_index.get("httpd")
+        obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False, index=access_index)
         assert obs.http_version == proto
         baseline["payload"]["request"]["method"] = obs.method
         baseline["payload"]["request"]["url"] = obs.url
@@ -126,16 +133,15 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = obs.http_version
         baseline["payload"]["pause_resume"] = _parse_pause_resume(
-            list(baseline["payload"].get("stderr") or []),
+            baseline["payload"].get("stderr") or (),
             pause_offset=pause_offset,
         )
-        write_json(baseline["path"], baseline["payload"])
 
         qcurl = run_qt_test(
             env=env,
             suite=suite,
             case=case_variant,
-            qt_executable=qt_path,
+            qt_executable=lc_qt_path,
             args=[],
             request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
             response_meta=resp_meta,
@@ -148,9 +154,10 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
                 "QCURL_LC_REQ_ID": qcurl_req_id,
                 "QCURL_LC_PAUSE_OFFSET": str(pause_offset),
             },
+            persist=False,
         )
 
-        obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False)
+        obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False, index=access_index)
         assert obs.http_version == proto
         qcurl["payload"]["request"]["method"] = obs.method
         qcurl["payload"]["request"]["url"] = obs.url
@@ -159,8 +166,9 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
         qcurl["payload"]["response"]["http_version"] = obs.http_version
 
         pause_resume_path = qcurl["path"].parent / "qcurl_run" / "pause_resume.json"
-        qcurl_pause = json.loads(pause_resume_path.read_text(encoding="utf-8"))
+        qcurl_pause = read_json(pause_resume_path)
         qcurl["payload"]["pause_resume"] = qcurl_pause
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
         assert int(qcurl_pause.get("pause_count") or 0) == 1
@@ -171,8 +179,9 @@ def test_p2_pause_resume_h2(env, lc_logs, tmp_path):
         assert baseline["payload"]["pause_resume"]["resume_count"] == 1
         assert baseline["payload"]["pause_resume"]["event_seq"] == ["pause", "resume", "finished"]
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
     except Exception:
+        write_results(baseline, qcurl)
         if collect_logs:
             collect_service_logs_for_case(
                 env,
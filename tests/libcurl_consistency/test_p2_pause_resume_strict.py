@@ -6,28 +6,21 @@ P2：pause/resume 强判据一致性。
 
 from __future__ import annotations
 
-import json
 import os
-import uuid
 from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, read_json, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
 from tests.libcurl_consistency.pytest_support.observed import httpd_observed_for_id
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_pause_resume_strict_h2(env, lc_qt_path, lc_logs, lc_access_log_index, tmp_path):
     collect_logs = should_collect_service_logs()
     suite = "p2_pause_resume_strict"
     proto = "h2"
@@ -38,7 +31,7 @@ def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
     resume_delay_ms = 200
     docname = "data-1m"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_{case_id}"
+    trace_base = f"lc_{trace_id()}_{case_id}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
@@ -49,6 +42,7 @@ def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
     case_dir = ensure_case_dir(artifacts_root(env), suite=suite, case=case_variant)
     baseline_events = case_dir / "baseline_pause_resume_events.json"
 
+    baseline = qcurl = None
     try:
         baseline = run_libtest_case(
             env=env,
@@ -69,24 +63,25 @@ def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
             request_meta={"method": "GET", "url": baseline_url, "headers": {}, "body": b""},
             response_meta=resp_meta,
             download_count=1,
+            persist=False,
         )
 
         access_log = Path(lc_logs["httpd_access_log"])
-        obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False)
+        access_index = lc_access_log_index.get("httpd")
+        obs = httpd_observed_for_id(access_log, baseline_req_id, require_range=False, index=access_index)
         assert obs.http_version == proto
         baseline["payload"]["request"]["method"] = obs.method
         baseline["payload"]["request"]["url"] = obs.url
         baseline["payload"]["request"]["headers"] = obs.headers
         baseline["payload"]["response"]["status"] = obs.status
         baseline["payload"]["response"]["http_version"] = obs.http_version
-        baseline["payload"]["pause_resume_strict"] = _load_json(baseline_events)
-        write_json(baseline["path"], baseline["payload"])
+        baseline["payload"]["pause_resume_strict"] = read_json(baseline_events)
 
         qcurl = run_qt_test(
             env=env,
             suite=suite,
             case=case_variant,
-            qt_executable=qt_path,
+            qt_executable=lc_qt_path,
             args=[],
             request_meta={"method": "GET", "url": qcurl_url, "headers": {}, "body": b""},
             response_meta=resp_meta,
@@ -100,9 +95,10 @@ def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
                 "QCURL_LC_PAUSE_OFFSET": str(pause_offset),
                 "QCURL_LC_RESUME_DELAY_MS": str(resume_delay_ms),
             },
+            persist=False,
         )
 
-        obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False)
+        obs = httpd_observed_for_id(access_log, qcurl_req_id, require_range=False, index=access_index)
         assert obs.http_version == proto
         qcurl["payload"]["request"]["method"] = obs.method
         qcurl["payload"]["request"]["url"] = obs.url
@@ -111,11 +107,13 @@ def test_p2_pause_resume_strict_h2(env, lc_logs, tmp_path):
         qcurl["payload"]["response"]["http_version"] = obs.http_version
 
         qcurl_events_path = qcurl["path"].parent / "qcurl_run" / "pause_resume_events.json"
-        qcurl["payload"]["pause_resume_strict"] = _load_json(qcurl_events_path)
+        qcurl["payload"]["pause_resume_strict"] = read_json(qcurl_events_path)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
     except Exception:
+        write_results(baseline, qcurl)
         if collect_logs:
             collect_service_logs_for_case(
                 env,
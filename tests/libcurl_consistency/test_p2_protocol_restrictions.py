@@ -7,15 +7,14 @@ P2：协议白名单与重定向协议限制一致性。
 from __future__ import annotations
 
 import os
-import re
 import uuid
-from pathlib import Path
 
 import pytest
 
 from tests.libcurl_consistency.pytest_support.artifacts import (
     apply_error_namespaces,
     build_request_semantic,
+    parse_curlcode_http_code,
     write_json,
 )
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
@@ -27,22 +26,7 @@ from tests.libcurl_consistency.pytest_support.observed import (
 )
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
-
-
-_CURLINFO_RE = re.compile(r"curlcode=(\d+)\s+http_code=(\d+)")
-
-
-def _parse_curlcode_http_code(stderr_lines: list[str]) -> tuple[int, int]:
-    for line in stderr_lines:
-        m = _CURLINFO_RE.search(line)
-        if m:
-            return int(m.group(1)), int(m.group(2))
-    return -1, -1
-
-
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 def test_p2_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
@@ -50,7 +34,7 @@ def test_p2_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_protocol_restrictions"
     proto = "http/1.1"
@@ -80,7 +64,7 @@ def test_p2_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
         )
 
         assert not parse_observe_http_log(observe_log), "协议白名单拒绝场景不应产生真实 HTTP 请求（baseline）"
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         assert curlcode == 1, f"baseline curlcode 期望为 1（UNSUPPORTED_PROTOCOL），实际为 {curlcode}"
         assert http_code == 0, f"baseline http_code 期望为 0，实际为 {http_code}"
         apply_error_namespaces(baseline["payload"], kind="protocol", http_status=0, curlcode=curlcode, http_code=http_code)
@@ -129,7 +113,7 @@ def test_p2_redir_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_protocol_restrictions"
     proto = "http/1.1"
@@ -140,8 +124,8 @@ def test_p2_redir_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/redir/1"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
 
     resp_meta = {"status": 302, "http_version": proto, "headers": {}, "body": None}
 
@@ -170,7 +154,7 @@ def test_p2_redir_protocols_block_http_http_1_1(env, lc_logs, lc_observe_http):
 
         obs_list = observe_http_observed_list_for_id(observe_log, baseline_req_id, expected_count=1)
         obs = obs_list[0]
-        curlcode, http_code = _parse_curlcode_http_code(list(baseline["payload"].get("stderr") or []))
+        curlcode, http_code = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())
         assert curlcode == 1, f"baseline curlcode 期望为 1（UNSUPPORTED_PROTOCOL），实际为 {curlcode}"
         assert http_code == obs.status, f"baseline http_code 与服务端观测不一致：{http_code} != {obs.status}"
 
@@ -7,7 +7,6 @@ from __future__ import annotations
 import hashlib
 import os
 import uuid
-from pathlib import Path
 
 import pytest
 
@@ -22,16 +21,12 @@ from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_ma
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_for_id
 from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
+from tests.libcurl_consistency.pytest_support.urls import append_req_id
 
 
 _FULL_BODY = bytes((ord("a") + (i % 26)) for i in range(32))
 
 
-def _append_req_id(url: str, req_id: str) -> str:
-    sep = "&" if "?" in url else "?"
-    return f"{url}{sep}id={req_id}"
-
-
 def _sha(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
@@ -49,7 +44,7 @@ def test_p2_range_boundaries(case_id, scenario, existing_size, expected_status,
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_range_boundaries"
     proto = "http/1.1"
@@ -60,8 +55,8 @@ def test_p2_range_boundaries(case_id, scenario, existing_size, expected_status,
     qcurl_req_id = f"{trace_base}__qcurl"
 
     url = f"http://localhost:{port}/range_boundary?scenario={scenario}"
-    baseline_url = _append_req_id(url, baseline_req_id)
-    qcurl_url = _append_req_id(url, qcurl_req_id)
+    baseline_url = append_req_id(url, baseline_req_id)
+    qcurl_url = append_req_id(url, qcurl_req_id)
     range_header = f"bytes={existing_size}-"
     qcurl_path = tmp_path / f"{case_id}.data"
     qcurl_path.write_bytes(_FULL_BODY[:existing_size])
@@ -188,7 +188,7 @@ def test_p2_share_handle_cookie_flow(env, lc_logs, lc_observe_http):
     qt_path = Path(os.environ["QCURL_QTTEST"])
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_share_handle"
     proto = "http/1.1"
@@ -315,7 +315,7 @@ def test_p2_share_handle_concurrency_contract(env, lc_logs, lc_observe_http):
     qt_path = Path(os.environ["QCURL_QTTEST"])
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_share_handle"
     case = "lc_p2_share_handle_cookie_concurrency"
@@ -52,7 +52,7 @@ def test_p2_blocking_extras_raw_body_post_sized_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_blocking_extras_raw_upload"
     proto = "http/1.1"
@@ -8,7 +8,6 @@ from __future__ import annotations
 
 import base64
 import os
-import re
 import uuid
 from pathlib import Path
 
@@ -17,7 +16,7 @@ from cryptography import x509
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import serialization
 
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, parse_curlcode_http_code, write_json
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.capability_manifest import guard_planned_test
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
@@ -25,17 +24,6 @@ from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-_CURLCODE_RE = re.compile(r"curlcode=(\d+)")
-
-
-def _parse_curlcode(stderr_lines) -> int:
-    for line in stderr_lines or []:
-        m = _CURLCODE_RE.search(str(line))
-        if m:
-            return int(m.group(1))
-    return -1
-
-
 def _tls_boundary(*, proto: str) -> dict[str, object]:
     return {
         "scheme": "https",
@@ -143,7 +131,7 @@ def test_p2_tls_pinned_public_key(mode: str, env, lc_logs, lc_observe_https, tmp
         if int(baseline["payload"].get("exit_code") or 0) == 6:
             pytest.fail("gate/planner should have excluded pinned public key case for this runtime")
         if mode != "match":
-            curlcode = _parse_curlcode(baseline["payload"].get("stderr"))
+            curlcode = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())[0]
             assert curlcode == 90, f"unexpected curlcode: {curlcode}"
             apply_error_namespaces(baseline["payload"], kind="tls", http_status=0)
         baseline["payload"]["ctbp"] = _make_ctbp_payload(proto=proto, mode=mode)
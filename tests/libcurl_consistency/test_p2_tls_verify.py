@@ -7,28 +7,22 @@ P2：TLS 校验成功/失败路径一致性。
 from __future__ import annotations
 
 import os
-import re
-import uuid
 from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import apply_error_namespaces, parse_curlcode_http_code, write_json, write_results
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
-from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
-from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_qttest, run_qt_test
+from tests.libcurl_consistency.pytest_support.compare import assert_payloads_match
+from tests.libcurl_consistency.pytest_support.ids import trace_id
+from tests.libcurl_consistency.pytest_support.qcurl_runner import run_qt_test
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-_CURLCODE_RE = re.compile(r"curlcode=(\d+)")
-
-
-def _parse_curlcode(stderr_lines) -> int:
-    for line in stderr_lines or []:
-        m = _CURLCODE_RE.search(str(line))
-        if m:
-            return int(m.group(1))
-    return -1
+# run_libtest_case/run_qt_test 只读取 meta，不修改；按 mode 共享模板
+_REQ_META_TMPL = {"method": "GET", "headers": {}, "body": b""}
+_RESP_META_OK = {"status": 200, "http_version": "http/1.1", "headers": {}, "body": None}
+_RESP_META_TLS_FAIL = {"status": 0, "http_version": "tls", "headers": {}, "body": None}
 
 
 def _tls_boundary(*, proto: str, ca_cert: bool) -> dict[str, object]:
@@ -65,9 +59,7 @@ def _make_ctbp_payload(*, proto: str, mode: str) -> dict[str, object]:
 
 
 @pytest.mark.parametrize("mode", ["success_with_ca", "fail_no_ca"])
-def test_p2_tls_verify(mode: str, env, lc_logs, lc_observe_https, tmp_path):
-    qt_path = require_qcurl_qttest()
-
+def test_p2_tls_verify(mode: str, env, lc_qt_path, lc_logs, lc_observe_https, tmp_path):
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_https["port"])
     ca_cert = str(lc_observe_https["ca_cert"])
@@ -76,19 +68,17 @@ def test_p2_tls_verify(mode: str, env, lc_logs, lc_observe_https, tmp_path):
     proto = "http/1.1"
     case_variant = f"lc_tls_verify_{mode}"
 
-    trace_base = f"lc_{uuid.uuid4().hex[:8]}_tls_{mode}"
+    trace_base = f"lc_{trace_id()}_tls_{mode}"
     baseline_req_id = f"{trace_base}__baseline"
     qcurl_req_id = f"{trace_base}__qcurl"
 
     # 握手失败时服务端不会收到 HTTP 请求，因此这里不追加 id，也不依赖服务端日志。
     url = f"https://localhost:{port}/cookie"
 
-    req_meta = {"method": "GET", "url": url, "headers": {}, "body": b""}
-    if mode == "success_with_ca":
-        resp_meta = {"status": 200, "http_version": proto, "headers": {}, "body": None}
-    else:
-        resp_meta = {"status": 0, "http_version": "tls", "headers": {}, "body": None}
+    req_meta = {**_REQ_META_TMPL, "url": url}
+    resp_meta = _RESP_META_OK if mode == "success_with_ca" else _RESP_META_TLS_FAIL
 
+    baseline = qcurl = None
     try:
         baseline_args = ["-V", proto, "--secure"]
         if mode == "success_with_ca":
@@ -105,14 +95,14 @@ def test_p2_tls_verify(mode: str, env, lc_logs, lc_observe_https, tmp_path):
             response_meta=resp_meta,
             download_count=1 if mode == "success_with_ca" else None,
             allowed_exit_codes={0, 7} if mode != "success_with_ca" else None,
+            persist=False,
         )
 
         if mode != "success_with_ca":
-            curlcode = _parse_curlcode(baseline["payload"].get("stderr"))
+            curlcode = parse_curlcode_http_code(baseline["payload"].get("stderr") or ())[0]
             assert curlcode == 60, f"unexpected curlcode: {curlcode}"
             apply_error_namespaces(baseline["payload"], kind="tls", http_status=0)
         baseline["payload"]["ctbp"] = _make_ctbp_payload(proto=proto, mode=mode)
-        write_json(baseline["path"], baseline["payload"])
 
         qcurl_env = {
             "QCURL_LC_CASE_ID": "p2_tls_verify_success" if mode == "success_with_ca" else "p2_tls_verify_fail_no_ca",
@@ -126,21 +116,24 @@ def test_p2_tls_verify(mode: str, env, lc_logs, lc_observe_https, tmp_path):
             env=env,
             suite=suite,
             case=case_variant,
-            qt_executable=qt_path,
+            qt_executable=lc_qt_path,
             args=[],
-            request_meta={"method": "GET", "url": url, "headers": {}, "body": b""},
+            request_meta=req_meta,
             response_meta=resp_meta,
             download_count=1 if mode == "success_with_ca" else None,
             case_env=qcurl_env,
+            persist=False,
         )
 
         if mode != "success_with_ca":
             apply_error_namespaces(qcurl["payload"], kind="tls", http_status=0)
         qcurl["payload"]["ctbp"] = _make_ctbp_payload(proto=proto, mode=mode)
+        write_json(baseline["path"], baseline["payload"])
         write_json(qcurl["path"], qcurl["payload"])
 
-        assert_artifacts_match(baseline["path"], qcurl["path"])
+        assert_payloads_match(baseline["payload"], qcurl["payload"])
     except Exception:
+        write_results(baseline, qcurl)
         if collect_logs:
             collect_service_logs_for_case(
                 env,
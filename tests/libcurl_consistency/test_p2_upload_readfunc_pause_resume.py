@@ -9,14 +9,12 @@ P2：上传 READFUNC_PAUSE 自动恢复一致性（可观测数据层面最小
 
 from __future__ import annotations
 
-import json
 import os
 import uuid
-from pathlib import Path
 
 import pytest
 
-from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, sha256_bytes, write_json
+from tests.libcurl_consistency.pytest_support.artifacts import artifacts_root, ensure_case_dir, read_json, sha256_bytes, write_json
 from tests.libcurl_consistency.pytest_support.baseline import run_libtest_case
 from tests.libcurl_consistency.pytest_support.compare import assert_artifacts_match
 from tests.libcurl_consistency.pytest_support.observed import observe_http_observed_list_for_id
@@ -24,10 +22,6 @@ from tests.libcurl_consistency.pytest_support.qcurl_runner import require_qcurl_
 from tests.libcurl_consistency.pytest_support.service_logs import collect_service_logs_for_case, should_collect_service_logs
 
 
-def _load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
 def _normalize_req_headers(headers: dict) -> dict:
     out: dict = {}
     for name in ("host", "content-length", "transfer-encoding", "expect"):
@@ -42,7 +36,7 @@ def test_p2_upload_readfunc_pause_resume_http_1_1(env, lc_observe_http):
 
     collect_logs = should_collect_service_logs()
     port = int(lc_observe_http["port"])
-    observe_log = Path(str(lc_observe_http["log_file"]))
+    observe_log = lc_observe_http["log_file"]
 
     suite = "p2_upload_pause_resume"
     proto = "http/1.1"
@@ -106,7 +100,7 @@ def test_p2_upload_readfunc_pause_resume_http_1_1(env, lc_observe_http):
         baseline["payload"]["response"]["status"] = obs_base[0].status
         baseline["payload"]["response"]["http_version"] = proto
         baseline["payload"]["response"]["headers"] = dict(obs_base[0].response_headers)
-        baseline["payload"]["upload_pause_resume"] = _load_json(baseline_events)
+        baseline["payload"]["upload_pause_resume"] = read_json(baseline_events)
         write_json(baseline["path"], baseline["payload"])
 
         observe_log.write_text("", encoding="utf-8")
@@ -150,7 +144,7 @@ def test_p2_upload_readfunc_pause_resume_http_1_1(env, lc_observe_http):
         qcurl["payload"]["response"]["headers"] = dict(obs_q[0].response_headers)
 
         qcurl_events_path = qcurl["path"].parent / "qcurl_run" / "upload_pause_resume.json"
-        qcurl["payload"]["upload_pause_resume"] = _load_json(qcurl_events_path)
+        qcurl["payload"]["upload_pause_resume"] = read_json(qcurl_events_path)
         write_json(qcurl["path"], qcurl["payload"])
 
         assert_artifacts_match(baseline["path"], qcurl["path"])
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.libcurl_consistency.pytest_support.pair_runner import pair_results, run_pair
+
+
+def _fail() -> dict:
+    raise AssertionError("baseline failed")
+
+
+@pytest.mark.parametrize("serial", ["0", "1"])
+def test_run_pair_keeps_completed_side_when_other_fails(serial: str, monkeypatch) -> None:
+    monkeypatch.setenv("QCURL_LC_SERIAL_RUNS", serial)
+
+    with pytest.raises(AssertionError) as excinfo:
+        run_pair(lambda: {"side": "baseline"}, _fail)
+
+    assert pair_results(excinfo.value, None, None) == ({"side": "baseline"}, None)
+
+
+def test_run_pair_waits_for_qcurl_before_raising_baseline_error(monkeypatch) -> None:
+    monkeypatch.delenv("QCURL_LC_SERIAL_RUNS", raising=False)
+
+    with pytest.raises(AssertionError, match="baseline failed") as excinfo:
+        run_pair(_fail, lambda: {"side": "qcurl"})
+
+    assert pair_results(excinfo.value, None, None) == (None, {"side": "qcurl"})
+
+
+def test_pair_results_follows_exception_chain() -> None:
+    try:
+        try:
+            run_pair(_fail, lambda: {"side": "qcurl"})
+        except AssertionError as exc:
+            raise RuntimeError("wrapped") from exc
+    except RuntimeError as exc:
+        assert pair_results(exc, None, None) == (None, {"side": "qcurl"})
+
+
+def test_pair_results_falls_back_to_caller_values() -> None:
+    assert pair_results(ValueError("later"), {"b": 1}, {"q": 2}) == ({"b": 1}, {"q": 2})
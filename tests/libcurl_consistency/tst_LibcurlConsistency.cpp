@@ -1845,10 +1845,10 @@ void TestLibcurlConsistency::testCase()
         QVERIFY(observeHttpPort > 0);
 
         QCNetworkTimeoutConfig timeout;
-        timeout.setTotalTimeout(std::chrono::milliseconds(200));
+        timeout.setTotalTimeout(std::chrono::milliseconds(100));
 
         QCNetworkRequest req(
-            withRequestId(QUrl(QStringLiteral("http://localhost:%1/delay_headers/1000")
+            withRequestId(QUrl(QStringLiteral("http://localhost:%1/delay_headers/500")
                                    .arg(observeHttpPort)),
                           requestId));
         req.setHttpVersion(httpVersion);
@@ -1871,11 +1871,11 @@ void TestLibcurlConsistency::testCase()
         QVERIFY(observeHttpPort > 0);
 
         QCNetworkTimeoutConfig timeout;
-        timeout.setLowSpeedTime(std::chrono::seconds(2));
+        timeout.setLowSpeedTime(std::chrono::seconds(1));
         timeout.setLowSpeedLimit(1024);
 
         QCNetworkRequest req(
-            withRequestId(QUrl(QStringLiteral("http://localhost:%1/stall_body/8192/5000")
+            withRequestId(QUrl(QStringLiteral("http://localhost:%1/stall_body/8192/4000")
                                    .arg(observeHttpPort)),
                           requestId));
         req.setHttpVersion(httpVersion);
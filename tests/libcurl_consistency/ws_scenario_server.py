@@ -13,12 +13,12 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import inspect
 import json
 import logging
-from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, TextIO
 from urllib.parse import parse_qs, urlsplit
 
 from websockets import server
@@ -28,22 +28,37 @@ from websockets.exceptions import ConnectionClosedError
 log = logging.getLogger(__name__)
 
 
-@dataclass(frozen=True)
-class WsHandshakeLog:
-    ts: str
-    path: str
-    id: str
-    headers: dict
-
-
 HANDSHAKE_LOG_FILE: Optional[Path] = None
 EVENTS_LOG_FILE: Optional[Path] = None
+# 日志句柄按路径常驻（行缓冲）：每条记录仍立即落盘，但不再逐条 open/close
+_LOG_FPS: Dict[Path, TextIO] = {}
+# JSONL 记录复用同一 encoder，并使用紧凑分隔符
+_JSON_ENCODE = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+# 握手日志记录的请求头（固定顺序，保证日志字段顺序稳定）
+_HANDSHAKE_HEADER_ALLOWLIST = (
+    "upgrade",
+    "connection",
+    "sec-websocket-version",
+    "sec-websocket-extensions",
+    "host",
+)
+# ping() 在新版 websockets 中为协程（返回 pong waiter），旧版直接返回 Future；导入时判定一次
+_PING_IS_ASYNC = inspect.iscoroutinefunction(server.WebSocketServerProtocol.ping)
 
 
 def _append_jsonl(path: Path, payload: dict) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as fp:
-        fp.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    fp = _LOG_FPS.get(path)
+    if fp is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fp = path.open("a", encoding="utf-8", buffering=1)
+        _LOG_FPS[path] = fp
+    fp.write(_JSON_ENCODE(payload) + "\n")
+
+
+def _close_logs() -> None:
+    for fp in _LOG_FPS.values():
+        fp.close()
+    _LOG_FPS.clear()
 
 
 def _log_event(req_id: str, scenario: str, event: str, **extra: object) -> None:
@@ -63,7 +78,7 @@ def _log_event(req_id: str, scenario: str, event: str, **extra: object) -> None:
 
 async def _ping_and_wait_pong(websocket, payload: bytes, *, timeout_s: float) -> bool:
     waiter = websocket.ping(payload)
-    if asyncio.iscoroutine(waiter):
+    if _PING_IS_ASYNC:
         waiter = await waiter
     try:
         await asyncio.wait_for(waiter, timeout=timeout_s)
@@ -72,42 +87,53 @@ async def _ping_and_wait_pong(websocket, payload: bytes, *, timeout_s: float) ->
         return False
 
 
-async def _run_scenario(websocket, scenario: str, req_id: str) -> None:
-    if scenario == "lc_ping":
-        payload = b""
-        _log_event(req_id, scenario, "server_ping_sent", payload_hex="")
-        ok = await _ping_and_wait_pong(websocket, payload, timeout_s=5.0)
-        _log_event(req_id, scenario, "server_pong_ok" if ok else "server_pong_timeout")
-        if not ok:
-            await websocket.close(code=1011, reason="pong timeout")
-            return
-        await websocket.close(code=1000, reason="done")
-        _log_event(req_id, scenario, "server_close_sent", close_code=1000, reason="done")
+async def _scenario_lc_ping(websocket, scenario: str, req_id: str) -> None:
+    payload = b""
+    _log_event(req_id, scenario, "server_ping_sent", payload_hex="")
+    ok = await _ping_and_wait_pong(websocket, payload, timeout_s=5.0)
+    _log_event(req_id, scenario, "server_pong_ok" if ok else "server_pong_timeout")
+    if not ok:
+        await websocket.close(code=1011, reason="pong timeout")
         return
-
-    if scenario == "lc_frame_types":
-        await websocket.send("txt")
-        _log_event(req_id, scenario, "server_text_sent", text="txt")
-        await websocket.send(b"bin")
-        _log_event(req_id, scenario, "server_binary_sent", payload_hex="62696e")
-
-        ping_payload = b"ping"
-        _log_event(req_id, scenario, "server_ping_sent", payload_hex=ping_payload.hex())
-        ok = await _ping_and_wait_pong(websocket, ping_payload, timeout_s=5.0)
-        _log_event(req_id, scenario, "server_pong_ok" if ok else "server_pong_timeout")
-        if not ok:
-            await websocket.close(code=1011, reason="pong timeout")
-            return
-
-        await websocket.pong(b"pong")
-        _log_event(req_id, scenario, "server_pong_sent", payload_hex="706f6e67")
-
-        await websocket.close(code=1000, reason="close")
-        _log_event(req_id, scenario, "server_close_sent", close_code=1000, reason="close")
+    await websocket.close(code=1000, reason="done")
+    _log_event(req_id, scenario, "server_close_sent", close_code=1000, reason="done")
+
+
+async def _scenario_lc_frame_types(websocket, scenario: str, req_id: str) -> None:
+    await websocket.send("txt")
+    _log_event(req_id, scenario, "server_text_sent", text="txt")
+    await websocket.send(b"bin")
+    _log_event(req_id, scenario, "server_binary_sent", payload_hex="62696e")
+
+    ping_payload = b"ping"
+    _log_event(req_id, scenario, "server_ping_sent", payload_hex="70696e67")
+    ok = await _ping_and_wait_pong(websocket, ping_payload, timeout_s=5.0)
+    _log_event(req_id, scenario, "server_pong_ok" if ok else "server_pong_timeout")
+    if not ok:
+        await websocket.close(code=1011, reason="pong timeout")
         return
 
-    _log_event(req_id, scenario, "server_unknown_scenario")
-    await websocket.close(code=1008, reason="unknown scenario")
+    await websocket.pong(b"pong")
+    _log_event(req_id, scenario, "server_pong_sent", payload_hex="706f6e67")
+
+    await websocket.close(code=1000, reason="close")
+    _log_event(req_id, scenario, "server_close_sent", close_code=1000, reason="close")
+
+
+# scenario 名 -> 处理协程；新增场景只需在此登记
+_SCENARIOS: Dict[str, Callable[[Any, str, str], Awaitable[None]]] = {
+    "lc_ping": _scenario_lc_ping,
+    "lc_frame_types": _scenario_lc_frame_types,
+}
+
+
+async def _run_scenario(websocket, scenario: str, req_id: str) -> None:
+    run = _SCENARIOS.get(scenario)
+    if run is None:
+        _log_event(req_id, scenario, "server_unknown_scenario")
+        await websocket.close(code=1008, reason="unknown scenario")
+        return
+    await run(websocket, scenario, req_id)
 
 
 async def handler(websocket):
@@ -118,26 +144,22 @@ async def handler(websocket):
 
     if HANDSHAKE_LOG_FILE is not None:
         req_headers = getattr(websocket, "request_headers", None)
-        headers_allowlist = [
-            "upgrade",
-            "connection",
-            "sec-websocket-version",
-            "sec-websocket-extensions",
-            "host",
-        ]
         headers = {}
         if req_headers is not None:
-            for name in headers_allowlist:
+            for name in _HANDSHAKE_HEADER_ALLOWLIST:
                 v = req_headers.get(name)
                 if v is not None:
                     headers[name] = v
-        log_entry = WsHandshakeLog(
-            ts=datetime.now(tz=timezone.utc).isoformat(),
-            path=path,
-            id=req_id,
-            headers=headers,
+        # 字段：ts/path/id/headers（parse_ws_handshake_log 按此读取）；直接构造 dict，省去 asdict 的深拷贝
+        _append_jsonl(
+            HANDSHAKE_LOG_FILE,
+            {
+                "ts": datetime.now(tz=timezone.utc).isoformat(),
+                "path": path,
+                "id": req_id,
+                "headers": headers,
+            },
         )
-        _append_jsonl(HANDSHAKE_LOG_FILE, asdict(log_entry))
 
     if scenario:
         await _run_scenario(websocket, scenario, req_id)
@@ -155,8 +177,11 @@ async def run_server(port: int, handshake_log: Optional[Path], events_log: Optio
     global EVENTS_LOG_FILE
     HANDSHAKE_LOG_FILE = handshake_log
     EVENTS_LOG_FILE = events_log
-    async with server.serve(handler, "localhost", port):
-        await asyncio.Future()
+    try:
+        async with server.serve(handler, "localhost", port):
+            await asyncio.Future()
+    finally:
+        _close_logs()
 
 
 def main() -> int: